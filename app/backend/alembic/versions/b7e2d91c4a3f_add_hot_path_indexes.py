@@ -0,0 +1,77 @@
+"""add hot path indexes
+
+Revision ID: b7e2d91c4a3f
+Revises: 14c60c6d7f70
+Create Date: 2026-10-17 09:12:44.310562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d91c4a3f'
+down_revision: Union[str, Sequence[str], None] = '14c60c6d7f70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_active_caves_data_user_anno_prov_mat'), 'active_caves_data', ['user_id', 'anno', 'provincia', 'materiale'], unique=False)
+    op.create_index(op.f('ix_active_caves_data_anno_prov'), 'active_caves_data', ['anno', 'provincia'], unique=False)
+    op.create_index(op.f('ix_annual_cave_data_user_anno'), 'annual_cave_data', ['user_id', 'anno'], unique=False)
+    op.create_index(op.f('ix_annual_cave_data_anno'), 'annual_cave_data', ['anno'], unique=False)
+    op.create_index(op.f('ix_cave_details_user_anno_prov_mat'), 'cave_details', ['user_id', 'anno', 'provincia', 'materiale'], unique=False)
+    op.create_index(op.f('ix_cave_details_anno_prov'), 'cave_details', ['anno', 'provincia'], unique=False)
+    op.create_index(op.f('ix_competitor_data_user_anno_prov_mat'), 'competitor_data', ['user_id', 'anno', 'provincia', 'materiale'], unique=False)
+    op.create_index(op.f('ix_competitor_data_anno_prov'), 'competitor_data', ['anno', 'provincia'], unique=False)
+    op.create_index(op.f('ix_destination_data_user_anno_prov_mat'), 'destination_data', ['user_id', 'anno', 'provincia', 'materiale'], unique=False)
+    op.create_index(op.f('ix_destination_data_anno_prov'), 'destination_data', ['anno', 'provincia'], unique=False)
+    op.create_index(op.f('ix_economic_data_user_anno_prov_mat'), 'economic_data', ['user_id', 'anno', 'provincia', 'materiale'], unique=False)
+    op.create_index(op.f('ix_economic_data_anno_prov'), 'economic_data', ['anno', 'provincia'], unique=False)
+    op.create_index(op.f('ix_employment_data_user_anno_prov_mat'), 'employment_data', ['user_id', 'anno', 'provincia', 'materiale'], unique=False)
+    op.create_index(op.f('ix_employment_data_anno_prov'), 'employment_data', ['anno', 'provincia'], unique=False)
+    op.create_index(op.f('ix_extraction_data_user_anno_prov_mat'), 'extraction_data', ['user_id', 'anno', 'provincia', 'materiale'], unique=False)
+    op.create_index(op.f('ix_extraction_data_anno_prov'), 'extraction_data', ['anno', 'provincia'], unique=False)
+    op.create_index(op.f('ix_price_data_user_anno_classe'), 'price_data', ['user_id', 'anno', 'classe_materiale'], unique=False)
+    op.create_index(op.f('ix_price_data_anno'), 'price_data', ['anno'], unique=False)
+    op.create_index(op.f('ix_province_material_data_user_anno_prov_mat'), 'province_material_data', ['user_id', 'anno', 'provincia', 'materiale'], unique=False)
+    op.create_index(op.f('ix_province_material_data_anno_prov'), 'province_material_data', ['anno', 'provincia'], unique=False)
+    op.create_index(op.f('ix_sales_data_user_anno_prov_mat'), 'sales_data', ['user_id', 'anno', 'provincia', 'materiale'], unique=False)
+    op.create_index(op.f('ix_sales_data_anno_prov'), 'sales_data', ['anno', 'provincia'], unique=False)
+    # regional_revenue_data is created outside the migration chain (create_regional_revenue_table.py)
+    if sa.inspect(op.get_bind()).has_table('regional_revenue_data'):
+        op.create_index(op.f('ix_regional_revenue_data_user_anno'), 'regional_revenue_data', ['user_id', 'anno'], unique=False)
+        op.create_index(op.f('ix_regional_revenue_data_anno'), 'regional_revenue_data', ['anno'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('regional_revenue_data'):
+        op.drop_index(op.f('ix_regional_revenue_data_anno'), table_name='regional_revenue_data')
+        op.drop_index(op.f('ix_regional_revenue_data_user_anno'), table_name='regional_revenue_data')
+    op.drop_index(op.f('ix_sales_data_anno_prov'), table_name='sales_data')
+    op.drop_index(op.f('ix_sales_data_user_anno_prov_mat'), table_name='sales_data')
+    op.drop_index(op.f('ix_province_material_data_anno_prov'), table_name='province_material_data')
+    op.drop_index(op.f('ix_province_material_data_user_anno_prov_mat'), table_name='province_material_data')
+    op.drop_index(op.f('ix_price_data_anno'), table_name='price_data')
+    op.drop_index(op.f('ix_price_data_user_anno_classe'), table_name='price_data')
+    op.drop_index(op.f('ix_extraction_data_anno_prov'), table_name='extraction_data')
+    op.drop_index(op.f('ix_extraction_data_user_anno_prov_mat'), table_name='extraction_data')
+    op.drop_index(op.f('ix_employment_data_anno_prov'), table_name='employment_data')
+    op.drop_index(op.f('ix_employment_data_user_anno_prov_mat'), table_name='employment_data')
+    op.drop_index(op.f('ix_economic_data_anno_prov'), table_name='economic_data')
+    op.drop_index(op.f('ix_economic_data_user_anno_prov_mat'), table_name='economic_data')
+    op.drop_index(op.f('ix_destination_data_anno_prov'), table_name='destination_data')
+    op.drop_index(op.f('ix_destination_data_user_anno_prov_mat'), table_name='destination_data')
+    op.drop_index(op.f('ix_competitor_data_anno_prov'), table_name='competitor_data')
+    op.drop_index(op.f('ix_competitor_data_user_anno_prov_mat'), table_name='competitor_data')
+    op.drop_index(op.f('ix_cave_details_anno_prov'), table_name='cave_details')
+    op.drop_index(op.f('ix_cave_details_user_anno_prov_mat'), table_name='cave_details')
+    op.drop_index(op.f('ix_annual_cave_data_anno'), table_name='annual_cave_data')
+    op.drop_index(op.f('ix_annual_cave_data_user_anno'), table_name='annual_cave_data')
+    op.drop_index(op.f('ix_active_caves_data_anno_prov'), table_name='active_caves_data')
+    op.drop_index(op.f('ix_active_caves_data_user_anno_prov_mat'), table_name='active_caves_data')
@@ -0,0 +1,107 @@
+"""add chapter rollup tables
+
+Revision ID: c3a8f5e19d27
+Revises: b7e2d91c4a3f
+Create Date: 2026-10-17 11:40:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a8f5e19d27'
+down_revision: Union[str, Sequence[str], None] = 'b7e2d91c4a3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Chapter table -> summed columns kept in <table>_rollup
+ROLLUP_FIELDS = {
+    'active_caves_data': ['numero_cave'],
+    'economic_data': ['fatturato', 'costi', 'utile_lordo', 'utile_netto'],
+    'employment_data': ['numero_occupati'],
+    'extraction_data': ['volume_m3'],
+    'province_material_data': ['numero_cave'],
+    'sales_data': ['volume_m3'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('active_caves_data_rollup',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('anno', sa.Integer(), nullable=False),
+    sa.Column('provincia', sa.String(), nullable=False),
+    sa.Column('materiale', sa.String(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('numero_cave', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'anno', 'provincia', 'materiale')
+    )
+    op.create_table('economic_data_rollup',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('anno', sa.Integer(), nullable=False),
+    sa.Column('provincia', sa.String(), nullable=False),
+    sa.Column('materiale', sa.String(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('fatturato', sa.Float(), nullable=False),
+    sa.Column('costi', sa.Float(), nullable=False),
+    sa.Column('utile_lordo', sa.Float(), nullable=False),
+    sa.Column('utile_netto', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'anno', 'provincia', 'materiale')
+    )
+    op.create_table('employment_data_rollup',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('anno', sa.Integer(), nullable=False),
+    sa.Column('provincia', sa.String(), nullable=False),
+    sa.Column('materiale', sa.String(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('numero_occupati', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'anno', 'provincia', 'materiale')
+    )
+    op.create_table('extraction_data_rollup',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('anno', sa.Integer(), nullable=False),
+    sa.Column('provincia', sa.String(), nullable=False),
+    sa.Column('materiale', sa.String(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('volume_m3', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'anno', 'provincia', 'materiale')
+    )
+    op.create_table('province_material_data_rollup',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('anno', sa.Integer(), nullable=False),
+    sa.Column('provincia', sa.String(), nullable=False),
+    sa.Column('materiale', sa.String(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('numero_cave', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'anno', 'provincia', 'materiale')
+    )
+    op.create_table('sales_data_rollup',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('anno', sa.Integer(), nullable=False),
+    sa.Column('provincia', sa.String(), nullable=False),
+    sa.Column('materiale', sa.String(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('volume_m3', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'anno', 'provincia', 'materiale')
+    )
+    # Backfill from the existing rows; afterwards the services keep them in sync
+    for table, fields in ROLLUP_FIELDS.items():
+        sums = ", ".join(f"sum({f})" for f in fields)
+        op.execute(
+            f"INSERT INTO {table}_rollup (user_id, anno, provincia, materiale, row_count, {', '.join(fields)}) "
+            f"SELECT user_id, anno, provincia, materiale, count(*), {sums} FROM {table} "
+            f"GROUP BY user_id, anno, provincia, materiale"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sales_data_rollup')
+    op.drop_table('province_material_data_rollup')
+    op.drop_table('extraction_data_rollup')
+    op.drop_table('employment_data_rollup')
+    op.drop_table('economic_data_rollup')
+    op.drop_table('active_caves_data_rollup')
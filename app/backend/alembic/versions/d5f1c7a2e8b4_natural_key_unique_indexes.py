@@ -0,0 +1,86 @@
+"""natural key unique indexes
+
+Revision ID: d5f1c7a2e8b4
+Revises: c3a8f5e19d27
+Create Date: 2026-10-17 14:05:31.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f1c7a2e8b4'
+down_revision: Union[str, Sequence[str], None] = 'c3a8f5e19d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# index name -> (table, natural key); the plain index of the same name is replaced
+NATURAL_KEYS = {
+    'ix_active_caves_data_user_anno_prov_mat': ('active_caves_data', ['user_id', 'anno', 'provincia', 'materiale']),
+    'ix_annual_cave_data_user_anno': ('annual_cave_data', ['user_id', 'anno']),
+    'ix_economic_data_user_anno_prov_mat': ('economic_data', ['user_id', 'anno', 'provincia', 'materiale']),
+    'ix_employment_data_user_anno_prov_mat': ('employment_data', ['user_id', 'anno', 'provincia', 'materiale']),
+    'ix_extraction_data_user_anno_prov_mat': ('extraction_data', ['user_id', 'anno', 'provincia', 'materiale']),
+    'ix_price_data_user_anno_classe': ('price_data', ['user_id', 'anno', 'classe_materiale']),
+    'ix_province_material_data_user_anno_prov_mat': ('province_material_data', ['user_id', 'anno', 'provincia', 'materiale']),
+    'ix_regional_revenue_data_user_anno': ('regional_revenue_data', ['user_id', 'anno']),
+    'ix_sales_data_user_anno_prov_mat': ('sales_data', ['user_id', 'anno', 'provincia', 'materiale']),
+}
+
+# Chapter table -> summed columns kept in <table>_rollup (see c3a8f5e19d27)
+ROLLUP_FIELDS = {
+    'active_caves_data': ['numero_cave'],
+    'economic_data': ['fatturato', 'costi', 'utile_lordo', 'utile_netto'],
+    'employment_data': ['numero_occupati'],
+    'extraction_data': ['volume_m3'],
+    'province_material_data': ['numero_cave'],
+    'sales_data': ['volume_m3'],
+}
+
+
+def _dedupe(table: str, key: list) -> None:
+    """Keep only the most recent row (highest id) of each natural key"""
+    columns = ', '.join(key)
+    op.execute(f"DELETE FROM {table} WHERE id NOT IN (SELECT max(id) FROM {table} GROUP BY {columns})")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    has_table = sa.inspect(op.get_bind()).has_table
+    for name, (table, key) in NATURAL_KEYS.items():
+        # regional_revenue_data is created outside the migration chain (create_regional_revenue_table.py)
+        if not has_table(table):
+            continue
+        _dedupe(table, key)
+        op.drop_index(op.f(name), table_name=table)
+        op.create_index(op.f(name), table, key, unique=True)
+
+    competitor_key = ['user_id', 'anno', 'provincia', 'materiale', 'tipo_concorrente']
+    _dedupe('competitor_data', competitor_key)
+    op.drop_index(op.f('ix_competitor_data_user_anno_prov_mat'), table_name='competitor_data')
+    op.create_index(op.f('ix_competitor_data_user_anno_prov_mat_tipo'), 'competitor_data', competitor_key, unique=True)
+
+    # Rebuild the rollups so they no longer count the removed duplicates
+    for table, fields in ROLLUP_FIELDS.items():
+        sums = ", ".join(f"sum({f})" for f in fields)
+        op.execute(f"DELETE FROM {table}_rollup")
+        op.execute(
+            f"INSERT INTO {table}_rollup (user_id, anno, provincia, materiale, row_count, {', '.join(fields)}) "
+            f"SELECT user_id, anno, provincia, materiale, count(*), {sums} FROM {table} "
+            f"GROUP BY user_id, anno, provincia, materiale"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_competitor_data_user_anno_prov_mat_tipo'), table_name='competitor_data')
+    op.create_index(op.f('ix_competitor_data_user_anno_prov_mat'), 'competitor_data', ['user_id', 'anno', 'provincia', 'materiale'], unique=False)
+    has_table = sa.inspect(op.get_bind()).has_table
+    for name, (table, key) in NATURAL_KEYS.items():
+        if not has_table(table):
+            continue
+        op.drop_index(op.f(name), table_name=table)
+        op.create_index(op.f(name), table, key, unique=False)
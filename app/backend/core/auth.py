@@ -1,9 +1,11 @@
+import asyncio
 import base64
 import hashlib
 import logging
 import secrets
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import httpx
 from core.config import settings
@@ -34,17 +36,39 @@ def generate_code_challenge(code_verifier: str) -> str:
     return base64.urlsafe_b64encode(digest).decode("utf-8").rstrip("=")
 
 
-async def get_jwks() -> Dict[str, Any]:
-    """Get JWKS (JSON Web Key Set) from OIDC provider."""
-    jwks_url = f"{settings.oidc_issuer_url}/.well-known/jwks.json"
+JWKS_FETCH_TIMEOUT = 60.0
+JWKS_DEFAULT_MAX_AGE = 300.0  # seconds, when the issuer sends no Cache-Control max-age
+JWKS_MAX_MAX_AGE = 86400.0
+JWKS_REFRESH_AHEAD = 0.8  # refresh in the background once this fraction of max-age has passed
+JWKS_MIN_FORCED_REFRESH_INTERVAL = 30.0  # unknown-kid refreshes are throttled to one per interval
+
+
+def _cache_max_age(cache_control: Optional[str]) -> float:
+    """max-age of a Cache-Control header (0 for no-store/no-cache, the default when absent)"""
+    if not cache_control:
+        return JWKS_DEFAULT_MAX_AGE
+    directives = [d.strip().lower() for d in cache_control.split(",")]
+    if "no-store" in directives or "no-cache" in directives:
+        return 0.0
+    for directive in directives:
+        if directive.startswith("max-age="):
+            try:
+                return min(max(float(directive[len("max-age="):]), 0.0), JWKS_MAX_MAX_AGE)
+            except ValueError:
+                break
+    return JWKS_DEFAULT_MAX_AGE
+
+
+async def _fetch_jwks(jwks_url: str) -> Tuple[Dict[str, Any], float]:
+    """Download the JWKS; returns (jwks, max-age in seconds)"""
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with httpx.AsyncClient(timeout=JWKS_FETCH_TIMEOUT) as client:
             logger.info(f"Fetching JWKS from: {jwks_url}")
             response = await client.get(jwks_url)
             response.raise_for_status()
             jwks_data = response.json()
             logger.info(f"Successfully fetched JWKS with {len(jwks_data.get('keys', []))} keys")
-            return jwks_data
+            return jwks_data, _cache_max_age(response.headers.get("cache-control"))
     except httpx.TimeoutException as e:
         logger.error(f"Timeout while fetching JWKS from {jwks_url}: {e}")
         raise Exception("Unable to retrieve authentication keys")
@@ -56,6 +80,74 @@ async def get_jwks() -> Dict[str, Any]:
         raise Exception("Unable to retrieve authentication keys")
 
 
+class JWKSCache:
+    """Process-wide cache of the issuer's JWKS
+
+    Keys are kept for the Cache-Control max-age of the JWKS response and refreshed in the
+    background shortly before they expire, so logins normally never wait on the issuer.
+    Fetches are single-flight: concurrent callers share one download.
+    """
+
+    def __init__(self):
+        self._url: Optional[str] = None
+        self._jwks: Optional[Dict[str, Any]] = None
+        self._fetched_at = 0.0
+        self._refresh_at = 0.0
+        self._expires_at = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+        self.fetches = 0
+
+    def clear(self) -> None:
+        self._url, self._jwks = None, None
+        self._fetched_at = self._refresh_at = self._expires_at = 0.0
+
+    async def get(self, jwks_url: str, force_refresh: bool = False) -> Dict[str, Any]:
+        if jwks_url != self._url:
+            self.clear()
+            self._url = jwks_url
+        now = time.monotonic()
+        if self._jwks is not None:
+            if force_refresh:
+                # An unknown kid may be a rotated key, or just a bogus token: refetch, but not too often
+                if now - self._fetched_at < JWKS_MIN_FORCED_REFRESH_INTERVAL:
+                    return self._jwks
+            elif now < self._expires_at:
+                if now >= self._refresh_at:
+                    self._start_fetch(jwks_url)
+                return self._jwks
+        return await asyncio.shield(self._start_fetch(jwks_url))
+
+    def _start_fetch(self, jwks_url: str) -> asyncio.Task:
+        """The running fetch, or a new one (a task is bound to its event loop, e.g. per Mangum call)"""
+        task = self._inflight
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._fetch(jwks_url))
+            # Failures are logged by _fetch_jwks; a failed background refresh keeps the cached keys
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight = task
+        return task
+
+    async def _fetch(self, jwks_url: str) -> Dict[str, Any]:
+        self.fetches += 1
+        jwks, max_age = await _fetch_jwks(jwks_url)
+        if jwks_url == self._url:
+            now = time.monotonic()
+            self._jwks = jwks
+            self._fetched_at = now
+            self._refresh_at = now + max_age * JWKS_REFRESH_AHEAD
+            self._expires_at = now + max_age
+        return jwks
+
+
+jwks_cache = JWKSCache()
+
+
+async def get_jwks(force_refresh: bool = False) -> Dict[str, Any]:
+    """Get JWKS (JSON Web Key Set) from OIDC provider (cached, see JWKSCache)."""
+    jwks_url = f"{settings.oidc_issuer_url}/.well-known/jwks.json"
+    return await jwks_cache.get(jwks_url, force_refresh=force_refresh)
+
+
 class IDTokenValidationError(Exception):
     """Custom exception for ID token validation errors."""
 
@@ -123,6 +215,13 @@ def decode_access_token(token: str) -> Dict[str, Any]:
         raise AccessTokenError("Invalid authentication token") from exc
 
 
+def _find_jwk(jwks: Dict[str, Any], kid: str) -> Optional[Dict[str, Any]]:
+    for jwk in jwks.get("keys", []):
+        if jwk.get("kid") == kid:
+            return jwk
+    return None
+
+
 async def validate_id_token(id_token: str) -> Optional[Dict[str, Any]]:
     """Validate ID token with proper JWT signature verification using JWKS."""
     try:
@@ -143,12 +242,14 @@ async def validate_id_token(id_token: str) -> Optional[Dict[str, Any]]:
             )
             raise IDTokenValidationError("Unable to retrieve authentication keys", "jwks_fetch_error")
 
-        # Find the matching key
-        key = None
-        for jwk in jwks.get("keys", []):
-            if jwk.get("kid") == kid:
-                key = jwk
-                break
+        # Find the matching key; an unknown kid may mean the issuer rotated its keys
+        key = _find_jwk(jwks, kid)
+        if not key:
+            try:
+                key = _find_jwk(await get_jwks(force_refresh=True), kid)
+            except Exception as e:
+                logger.error(f"ID token validation failed: Failed to refresh JWKS for unknown kid {kid}: {e}")
+                raise IDTokenValidationError("Unable to retrieve authentication keys", "jwks_fetch_error")
 
         if not key:
             logger.error(
@@ -25,6 +25,16 @@ class Settings(BaseSettings):
     # Environment
     environment: str = "development"  # development, staging, production
 
+    # In-process cache of entity list results (0 entries disables it)
+    query_cache_size: int = 512
+    query_cache_ttl: float = 300.0  # seconds
+
+    # Browser/CDN freshness of the unauthenticated /all routes (revalidated with ETags after that)
+    public_cache_max_age: int = 60  # seconds
+
+    # Response compression: bodies below this size are sent as is (0 disables compression)
+    compression_min_size: int = 1024  # bytes
+
     @property
     def backend_url(self) -> str:
         """Generate backend URL from host and port."""
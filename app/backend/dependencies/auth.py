@@ -1,7 +1,9 @@
 import hashlib
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
 from core.auth import AccessTokenError, decode_access_token
 from fastapi import Depends, HTTPException, Request, status
@@ -12,6 +14,10 @@ logger = logging.getLogger(__name__)
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+# Verified access tokens: sha256(token) -> (exp as a UNIX timestamp, user), least recently used first
+TOKEN_CACHE_SIZE = 1024
+_token_cache: "OrderedDict[bytes, Tuple[float, UserResponse]]" = OrderedDict()
+
 
 async def get_bearer_token(
     request: Request, credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
@@ -24,8 +30,36 @@ async def get_bearer_token(
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication credentials were not provided")
 
 
+def clear_token_cache() -> None:
+    """Forget all verified tokens (e.g. after rotating the JWT secret)."""
+    _token_cache.clear()
+
+
 async def get_current_user(token: str = Depends(get_bearer_token)) -> UserResponse:
-    """Dependency to get current authenticated user via JWT token."""
+    """Dependency to get current authenticated user via JWT token.
+
+    Verified tokens are remembered (by hash) until their `exp`, so the parallel requests of a
+    page skip the signature check and claim parsing.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    cached = _token_cache.get(key)
+    if cached is not None:
+        expires_at, user = cached
+        if expires_at > time.time():
+            _token_cache.move_to_end(key)
+            return user
+        del _token_cache[key]
+
+    user, expires_at = _verify_token(token)
+    if expires_at is not None and TOKEN_CACHE_SIZE > 0:
+        _token_cache[key] = (expires_at, user)
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return user
+
+
+def _verify_token(token: str) -> Tuple[UserResponse, Optional[float]]:
+    """Decode the access token into the user and its expiry time (None when it has no exp)."""
     try:
         payload = decode_access_token(token)
     except AccessTokenError as exc:
@@ -47,13 +81,15 @@ async def get_current_user(token: str = Depends(get_bearer_token)) -> UserRespon
             user_hash = hashlib.sha256(str(user_id).encode()).hexdigest()[:8] if user_id else "unknown"
             logger.debug("Failed to parse last_login for user hash: %s", user_hash)
 
-    return UserResponse(
+    user = UserResponse(
         id=user_id,
         email=payload.get("email", ""),
         name=payload.get("name"),
         role=payload.get("role", "user"),
         last_login=last_login,
     )
+    exp = payload.get("exp")
+    return user, float(exp) if isinstance(exp, (int, float)) else None
 
 
 async def get_admin_user(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
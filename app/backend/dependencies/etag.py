@@ -0,0 +1,89 @@
+import hashlib
+import time
+import uuid
+from typing import Optional, Sequence
+
+from core.config import settings
+from dependencies.auth import get_current_user
+from fastapi import Depends, HTTPException, Request, Response, status
+from models.registry import ENTITY_MODELS
+from schemas.auth import UserResponse
+from utils.cache import query_cache
+
+# Versions are per-process counters, so ETags from another process (or before a restart) never match
+_PROCESS_EPOCH = uuid.uuid4().hex
+
+
+def _epoch() -> str:
+    """Process epoch, plus the current cache-TTL window while no invalidation listener runs
+
+    Without the listener (e.g. on Lambda) writes by other instances are not seen, so ETags
+    roll over every TTL to bound how long a stale 304 can be served.
+    """
+    if query_cache.listening:
+        return _PROCESS_EPOCH
+    return f"{_PROCESS_EPOCH}:{int(time.time() // settings.query_cache_ttl)}"
+
+
+def compute_etag(request: Request, tables: Sequence[str], user_id: Optional[str]) -> str:
+    """Strong ETag of a GET from the tables' write versions, the user, the path and the query string"""
+    versions = ",".join(f"{table}:{query_cache.version(table, user_id)}" for table in sorted(tables))
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    key = f"{_epoch()}|{versions}|{user_id or ''}|{request.url.path}?{query}"
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for GET)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+
+
+def _resolve_tables(request: Request, tables: Sequence[str]) -> Optional[list]:
+    """Format "{entity}"-style placeholders with the path params; None if a table is unknown"""
+    resolved = [table.format(**request.path_params) for table in tables]
+    if any(table not in ENTITY_MODELS for table in resolved):
+        return None
+    return resolved
+
+
+def _check(request: Request, response: Response, tables: Sequence[str], user_id: Optional[str]) -> None:
+    resolved = _resolve_tables(request, tables)
+    if resolved is None:
+        return  # let the endpoint report the unknown entity
+    etag = compute_etag(request, resolved, user_id)
+    if user_id is None:
+        cache_control = f"public, max-age={settings.public_cache_max_age}"
+    else:
+        cache_control = "private, no-cache"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if user_id is not None:
+        headers["Vary"] = "Authorization"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+def conditional_get(*tables: str, public: bool = False):
+    """Route dependency answering 304 Not Modified before any database work
+
+    `tables` are the tables the response is computed from ("{entity}" is filled from the
+    path). The ETag changes whenever a write bumps one of their versions for the user (see
+    utils.cache.query_cache). `public` routes are unauthenticated and get a short shared
+    max-age; the others are private and always revalidated.
+    """
+    if public:
+        async def check_public(request: Request, response: Response) -> None:
+            _check(request, response, tables, None)
+
+        return check_public
+
+    async def check_private(
+        request: Request, response: Response, current_user: UserResponse = Depends(get_current_user)
+    ) -> None:
+        _check(request, response, tables, str(current_user.id))
+
+    return check_private
@@ -5,6 +5,7 @@ import pkgutil
 from contextlib import asynccontextmanager
 from datetime import datetime
 
+from core.compression import CompressionMiddleware
 from core.config import settings
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -14,6 +15,7 @@ from fastapi.routing import APIRouter
 from services.database import initialize_database, close_database
 from services.mock_data import initialize_mock_data
 from services.auth import initialize_admin_user
+from services.invalidation import start_invalidation_listener, stop_invalidation_listener
 # MODULE_IMPORTS_END
 
 
@@ -67,11 +69,13 @@ async def lifespan(app: FastAPI):
     await initialize_database()
     await initialize_mock_data()
     await initialize_admin_user()
+    await start_invalidation_listener()
     # MODULE_STARTUP_END
 
     logger.info("=== Application startup completed successfully ===")
     yield
     # MODULE_SHUTDOWN_START
+    await stop_invalidation_listener()
     await close_database()
     # MODULE_SHUTDOWN_END
 
@@ -93,6 +97,7 @@ app.add_middleware(
     allow_headers=["*"],
     expose_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_size)
 # MODULE_MIDDLEWARE_END
 
 
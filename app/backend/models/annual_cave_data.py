@@ -1,10 +1,14 @@
 from core.database import Base
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String
 
 
 class Annual_cave_data(Base):
     __tablename__ = "annual_cave_data"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_annual_cave_data_user_anno", "user_id", "anno", unique=True),
+        Index("ix_annual_cave_data_anno", "anno"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
     user_id = Column(String, nullable=False)
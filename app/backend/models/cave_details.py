@@ -1,10 +1,14 @@
 from core.database import Base
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String
 
 
 class Cave_details(Base):
     __tablename__ = "cave_details"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_cave_details_user_anno_prov_mat", "user_id", "anno", "provincia", "materiale"),
+        Index("ix_cave_details_anno_prov", "anno", "provincia"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
     user_id = Column(String, nullable=False)
@@ -1,10 +1,18 @@
 from core.database import Base
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String
 
 
 class Competitor_data(Base):
     __tablename__ = "competitor_data"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index(
+            "ix_competitor_data_user_anno_prov_mat_tipo",
+            "user_id", "anno", "provincia", "materiale", "tipo_concorrente",
+            unique=True,
+        ),
+        Index("ix_competitor_data_anno_prov", "anno", "provincia"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
     anno = Column(Integer, nullable=False)
@@ -1,10 +1,14 @@
 from core.database import Base
-from sqlalchemy import Column, DateTime, Float, Integer, String
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
 
 
 class Price_data(Base):
     __tablename__ = "price_data"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_price_data_user_anno_classe", "user_id", "anno", "classe_materiale", unique=True),
+        Index("ix_price_data_anno", "anno"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
     anno = Column(Integer, nullable=False)
@@ -1,10 +1,14 @@
 from core.database import Base
-from sqlalchemy import Column, Float, Integer, String
+from sqlalchemy import Column, Float, Index, Integer, String
 
 
 class Regional_revenue_data(Base):
     __tablename__ = "regional_revenue_data"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_regional_revenue_data_user_anno", "user_id", "anno", unique=True),
+        Index("ix_regional_revenue_data_anno", "anno"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
     user_id = Column(String, nullable=False)
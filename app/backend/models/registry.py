@@ -0,0 +1,69 @@
+from models.active_caves_data import Active_caves_data
+from models.annual_cave_data import Annual_cave_data
+from models.cave_details import Cave_details
+from models.competitor_data import Competitor_data
+from models.config_foreign_destinations import Config_foreign_destinations
+from models.config_materials import Config_materials
+from models.config_price_materials import Config_price_materials
+from models.config_provinces import Config_provinces
+from models.destination_data import Destination_data
+from models.economic_data import Economic_data
+from models.employment_data import Employment_data
+from models.extraction_data import Extraction_data
+from models.price_data import Price_data
+from models.province_material_data import Province_material_data
+from models.regional_revenue_data import Regional_revenue_data
+from models.sales_data import Sales_data
+
+# Entity name (as used in /api/v1/entities/<entity>) -> ORM model
+ENTITY_MODELS = {
+    model.__tablename__: model
+    for model in (
+        Active_caves_data,
+        Annual_cave_data,
+        Cave_details,
+        Competitor_data,
+        Config_foreign_destinations,
+        Config_materials,
+        Config_price_materials,
+        Config_provinces,
+        Destination_data,
+        Economic_data,
+        Employment_data,
+        Extraction_data,
+        Price_data,
+        Province_material_data,
+        Regional_revenue_data,
+        Sales_data,
+    )
+}
+
+# Report chapter (as used by data reset and chapter replace) -> the tables it owns
+CHAPTER_MODELS = {
+    "cave_autorizzate": [Annual_cave_data, Cave_details, Province_material_data],
+    "cave_attive": [Active_caves_data],
+    "estrazioni": [Extraction_data],
+    "vendite": [Sales_data],
+    "dati_economici": [Economic_data],
+    "occupazione": [Employment_data],
+    "prezzi": [Price_data],
+    "destinazioni": [Destination_data],
+    "concorrenti": [Competitor_data],
+    "incassi_regionali": [Regional_revenue_data],
+}
+
+
+def get_entity_model(entity: str):
+    """Look up the ORM model for an entity name"""
+    model = ENTITY_MODELS.get(entity)
+    if model is None:
+        raise ValueError(f"Unknown entity '{entity}'")
+    return model
+
+
+def get_chapter_models(chapter: str) -> list:
+    """Look up the ORM models of a report chapter"""
+    models = CHAPTER_MODELS.get(chapter)
+    if models is None:
+        raise ValueError(f"Unknown chapter '{chapter}'")
+    return models
@@ -0,0 +1,86 @@
+from core.database import Base
+from sqlalchemy import Column, Float, Integer, String
+
+# Summary tables keyed by (user_id, anno, provincia, materiale), one per chapter that the
+# dashboards aggregate. They are kept in sync by services.rollups on every write.
+
+
+class Extraction_data_rollup(Base):
+    """Per-group totals of extraction_data"""
+    __tablename__ = "extraction_data_rollup"
+    __table_args__ = {"extend_existing": True}
+
+    user_id = Column(String, primary_key=True)
+    anno = Column(Integer, primary_key=True)
+    provincia = Column(String, primary_key=True)
+    materiale = Column(String, primary_key=True)
+    row_count = Column(Integer, nullable=False)
+    volume_m3 = Column(Float, nullable=False)
+
+
+class Sales_data_rollup(Base):
+    """Per-group totals of sales_data"""
+    __tablename__ = "sales_data_rollup"
+    __table_args__ = {"extend_existing": True}
+
+    user_id = Column(String, primary_key=True)
+    anno = Column(Integer, primary_key=True)
+    provincia = Column(String, primary_key=True)
+    materiale = Column(String, primary_key=True)
+    row_count = Column(Integer, nullable=False)
+    volume_m3 = Column(Float, nullable=False)
+
+
+class Economic_data_rollup(Base):
+    """Per-group totals of economic_data"""
+    __tablename__ = "economic_data_rollup"
+    __table_args__ = {"extend_existing": True}
+
+    user_id = Column(String, primary_key=True)
+    anno = Column(Integer, primary_key=True)
+    provincia = Column(String, primary_key=True)
+    materiale = Column(String, primary_key=True)
+    row_count = Column(Integer, nullable=False)
+    fatturato = Column(Float, nullable=False)
+    costi = Column(Float, nullable=False)
+    utile_lordo = Column(Float, nullable=False)
+    utile_netto = Column(Float, nullable=False)
+
+
+class Employment_data_rollup(Base):
+    """Per-group totals of employment_data"""
+    __tablename__ = "employment_data_rollup"
+    __table_args__ = {"extend_existing": True}
+
+    user_id = Column(String, primary_key=True)
+    anno = Column(Integer, primary_key=True)
+    provincia = Column(String, primary_key=True)
+    materiale = Column(String, primary_key=True)
+    row_count = Column(Integer, nullable=False)
+    numero_occupati = Column(Integer, nullable=False)
+
+
+class Active_caves_data_rollup(Base):
+    """Per-group totals of active_caves_data"""
+    __tablename__ = "active_caves_data_rollup"
+    __table_args__ = {"extend_existing": True}
+
+    user_id = Column(String, primary_key=True)
+    anno = Column(Integer, primary_key=True)
+    provincia = Column(String, primary_key=True)
+    materiale = Column(String, primary_key=True)
+    row_count = Column(Integer, nullable=False)
+    numero_cave = Column(Integer, nullable=False)
+
+
+class Province_material_data_rollup(Base):
+    """Per-group totals of province_material_data"""
+    __tablename__ = "province_material_data_rollup"
+    __table_args__ = {"extend_existing": True}
+
+    user_id = Column(String, primary_key=True)
+    anno = Column(Integer, primary_key=True)
+    provincia = Column(String, primary_key=True)
+    materiale = Column(String, primary_key=True)
+    row_count = Column(Integer, nullable=False)
+    numero_cave = Column(Integer, nullable=False)
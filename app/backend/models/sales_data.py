@@ -1,10 +1,14 @@
 from core.database import Base
-from sqlalchemy import Column, DateTime, Float, Integer, String
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
 
 
 class Sales_data(Base):
     __tablename__ = "sales_data"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_sales_data_user_anno_prov_mat", "user_id", "anno", "provincia", "materiale", unique=True),
+        Index("ix_sales_data_anno_prov", "anno", "provincia"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
     anno = Column(Integer, nullable=False)
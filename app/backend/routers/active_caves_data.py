@@ -1,6 +1,7 @@
 import json
 import logging
-from typing import List, Optional
+import time
+from typing import Any, Dict, List, Optional, Union
 
 from datetime import datetime, date
 
@@ -11,7 +12,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.database import get_db
 from services.active_caves_data import Active_caves_dataService
 from dependencies.auth import get_current_user
+from dependencies.etag import conditional_get
 from schemas.auth import UserResponse
+from schemas.entities import ProjectedListResponse
+from utils.query import parse_fields
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -58,9 +62,10 @@ class Active_caves_dataResponse(BaseModel):
 class Active_caves_dataListResponse(BaseModel):
     """List response schema"""
     items: List[Active_caves_dataResponse]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
 class Active_caves_dataBatchCreateRequest(BaseModel):
@@ -85,18 +90,24 @@ class Active_caves_dataBatchDeleteRequest(BaseModel):
 
 
 # ---------- Routes ----------
-@router.get("", response_model=Active_caves_dataListResponse)
+@router.get(
+    "",
+    response_model=Union[Active_caves_dataListResponse, ProjectedListResponse],
+    dependencies=[Depends(conditional_get("active_caves_data"))],
+)
 async def query_active_caves_datas(
-    query: str = Query(None, description="Query conditions (JSON string)"),
+    query: str = Query(None, description="Query conditions (JSON string); supports $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin, $like, $isnull"),
     sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Opaque cursor from a previous page's next_cursor (replaces skip)"),
+    count: str = Query("exact", pattern="^(exact|estimate|none)$", description="How to compute total: exact, estimate or none"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
     current_user: UserResponse = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Query active_caves_datas with filtering, sorting, and pagination (user can only see their own records)"""
-    logger.debug(f"Querying active_caves_datas: query={query}, sort={sort}, skip={skip}, limit={limit}, fields={fields}")
+    logger.debug(f"Querying active_caves_datas: query={query}, sort={sort}, skip={skip}, limit={limit}, cursor={cursor}, count={count}, fields={fields}")
     
     service = Active_caves_dataService(db)
     try:
@@ -113,28 +124,39 @@ async def query_active_caves_datas(
             limit=limit,
             query_dict=query_dict,
             sort=sort,
+            cursor=cursor,
+            count=count,
+            fields=parse_fields(fields),
             user_id=str(current_user.id),
         )
         logger.debug(f"Found {result['total']} active_caves_datas")
         return result
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying active_caves_datas: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@router.get("/all", response_model=Active_caves_dataListResponse)
+@router.get(
+    "/all",
+    response_model=Union[Active_caves_dataListResponse, ProjectedListResponse],
+    dependencies=[Depends(conditional_get("active_caves_data", public=True))],
+)
 async def query_active_caves_datas_all(
-    query: str = Query(None, description="Query conditions (JSON string)"),
+    query: str = Query(None, description="Query conditions (JSON string); supports $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin, $like, $isnull"),
     sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Opaque cursor from a previous page's next_cursor (replaces skip)"),
+    count: str = Query("exact", pattern="^(exact|estimate|none)$", description="How to compute total: exact, estimate or none"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
     db: AsyncSession = Depends(get_db),
 ):
     # Query active_caves_datas with filtering, sorting, and pagination without user limitation
-    logger.debug(f"Querying active_caves_datas: query={query}, sort={sort}, skip={skip}, limit={limit}, fields={fields}")
+    logger.debug(f"Querying active_caves_datas: query={query}, sort={sort}, skip={skip}, limit={limit}, cursor={cursor}, count={count}, fields={fields}")
 
     service = Active_caves_dataService(db)
     try:
@@ -150,18 +172,27 @@ async def query_active_caves_datas_all(
             skip=skip,
             limit=limit,
             query_dict=query_dict,
-            sort=sort
+            sort=sort,
+            cursor=cursor,
+            count=count,
+            fields=parse_fields(fields),
         )
         logger.debug(f"Found {result['total']} active_caves_datas")
         return result
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying active_caves_datas: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@router.get("/{id}", response_model=Active_caves_dataResponse)
+@router.get(
+    "/{id}",
+    response_model=Union[Active_caves_dataResponse, Dict[str, Any]],
+    dependencies=[Depends(conditional_get("active_caves_data"))],
+)
 async def get_active_caves_data(
     id: int,
     fields: str = Query(None, description="Comma-separated list of fields to return"),
@@ -173,7 +204,7 @@ async def get_active_caves_data(
     
     service = Active_caves_dataService(db)
     try:
-        result = await service.get_by_id(id, user_id=str(current_user.id))
+        result = await service.get_by_id(id, user_id=str(current_user.id), fields=parse_fields(fields))
         if not result:
             logger.warning(f"Active_caves_data with id {id} not found")
             raise HTTPException(status_code=404, detail="Active_caves_data not found")
@@ -181,6 +212,8 @@ async def get_active_caves_data(
         return result
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching active_caves_data {id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -221,22 +254,52 @@ async def create_active_caves_datas_batch(
     logger.debug(f"Batch creating {len(request.items)} active_caves_datas")
     
     service = Active_caves_dataService(db)
-    results = []
     
     try:
-        for item_data in request.items:
-            result = await service.create(item_data.model_dump(), user_id=str(current_user.id))
-            if result:
-                results.append(result)
-        
-        logger.info(f"Batch created {len(results)} active_caves_datas successfully")
+        started = time.perf_counter()
+        results = await service.create_many(
+            [item_data.model_dump() for item_data in request.items], user_id=str(current_user.id)
+        )
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Batch created {len(results)} active_caves_datas successfully "
+            f"({len(results) / elapsed if elapsed else 0:.0f} rows/s)"
+        )
         return results
+    except ValueError as e:
+        logger.error(f"Validation error in batch create: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         await db.rollback()
         logger.error(f"Error in batch create: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Batch create failed: {str(e)}")
 
 
+@router.post("/upsert", response_model=List[Active_caves_dataResponse])
+async def upsert_active_caves_datas_batch(
+    request: Active_caves_dataBatchCreateRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Insert or update multiple active_caves_datas by natural key in a single statement"""
+    logger.debug(f"Batch upserting {len(request.items)} active_caves_datas")
+    
+    service = Active_caves_dataService(db)
+    
+    try:
+        results = await service.upsert_many(
+            [item_data.model_dump() for item_data in request.items], user_id=str(current_user.id)
+        )
+        logger.info(f"Batch upserted {len(results)} active_caves_datas successfully")
+        return results
+    except ValueError as e:
+        logger.error(f"Validation error in batch upsert: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in batch upsert: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Batch upsert failed: {str(e)}")
+
+
 @router.put("/batch", response_model=List[Active_caves_dataResponse])
 async def update_active_caves_datas_batch(
     request: Active_caves_dataBatchUpdateRequest,
@@ -247,18 +310,20 @@ async def update_active_caves_datas_batch(
     logger.debug(f"Batch updating {len(request.items)} active_caves_datas")
     
     service = Active_caves_dataService(db)
-    results = []
     
     try:
-        for item in request.items:
-            # Only include non-None values for partial updates
-            update_dict = {k: v for k, v in item.updates.model_dump().items() if v is not None}
-            result = await service.update(item.id, update_dict, user_id=str(current_user.id))
-            if result:
-                results.append(result)
+        # Only include non-None values for partial updates
+        updates = {
+            item.id: {k: v for k, v in item.updates.model_dump().items() if v is not None}
+            for item in request.items
+        }
+        results = await service.update_many(updates, user_id=str(current_user.id))
         
         logger.info(f"Batch updated {len(results)} active_caves_datas successfully")
         return results
+    except ValueError as e:
+        logger.error(f"Validation error in batch update: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         await db.rollback()
         logger.error(f"Error in batch update: {str(e)}", exc_info=True)
@@ -296,6 +361,43 @@ async def update_active_caves_data(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.delete("")
+async def delete_active_caves_datas_by_query(
+    anno: int = Query(None, description="Delete the records of this year"),
+    query: str = Query(None, description="Additional JSON filter, same syntax as the list endpoint"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Delete all active_caves_datas matching a filter in a single statement (user's own records only)"""
+    logger.debug(f"Deleting active_caves_datas: anno={anno}, query={query}")
+    
+    service = Active_caves_dataService(db)
+    try:
+        query_dict = {}
+        if query:
+            try:
+                query_dict = json.loads(query)
+            except json.JSONDecodeError:
+                raise HTTPException(status_code=400, detail="Invalid query JSON format")
+            if not isinstance(query_dict, dict):
+                raise HTTPException(status_code=400, detail="Query must be a JSON object")
+        if anno is not None:
+            query_dict["anno"] = anno
+        if not query_dict:
+            raise HTTPException(status_code=400, detail="A filter (anno or query) is required")
+        
+        deleted_count = await service.delete_by_query(query_dict, user_id=str(current_user.id))
+        return {"message": f"Successfully deleted {deleted_count} active_caves_datas", "deleted_count": deleted_count}
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.error(f"Validation error deleting active_caves_datas: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error deleting active_caves_datas: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
 @router.delete("/batch")
 async def delete_active_caves_datas_batch(
     request: Active_caves_dataBatchDeleteRequest,
@@ -306,13 +408,9 @@ async def delete_active_caves_datas_batch(
     logger.debug(f"Batch deleting {len(request.ids)} active_caves_datas")
     
     service = Active_caves_dataService(db)
-    deleted_count = 0
     
     try:
-        for item_id in request.ids:
-            success = await service.delete(item_id, user_id=str(current_user.id))
-            if success:
-                deleted_count += 1
+        deleted_count = len(await service.delete_many(request.ids, user_id=str(current_user.id)))
         
         logger.info(f"Batch deleted {deleted_count} active_caves_datas successfully")
         return {"message": f"Successfully deleted {deleted_count} active_caves_datas", "deleted_count": deleted_count}
@@ -7,6 +7,8 @@ from core.database import get_db
 from dependencies.auth import get_current_user
 from schemas.auth import UserResponse
 from models.province_material_data import Province_material_data
+from services.invalidation import commit_changes
+from services.rollups import refresh_rollup_scope
 
 router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
 
@@ -18,7 +20,8 @@ async def reset_cave_autorizzate(
     """Reset all data in province_material_data table (Cave Autorizzate)"""
     try:
         result = await db.execute(delete(Province_material_data))
-        await db.commit()
+        await refresh_rollup_scope(db, Province_material_data)
+        await commit_changes(db, [Province_material_data.__tablename__])
         
         deleted_count = result.rowcount
         logging.info(f"Admin {current_user.id} deleted {deleted_count} records from province_material_data")
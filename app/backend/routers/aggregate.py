@@ -0,0 +1,95 @@
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from dependencies.auth import get_current_user
+from dependencies.etag import conditional_get
+from schemas.auth import UserResponse
+from services.aggregate import AggregateService
+from utils.query import parse_fields
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/aggregate", tags=["aggregate"])
+
+
+class AggregateResponse(BaseModel):
+    """Aggregation result: one item per group"""
+    entity: str
+    group_by: List[str]
+    items: List[Dict[str, Any]]
+
+
+async def _run_aggregate(
+    db: AsyncSession,
+    entity: str,
+    group_by: Optional[str],
+    metrics: str,
+    filter: Optional[str],
+    limit: int,
+    user_id: Optional[str] = None,
+    labels: bool = False,
+) -> Dict[str, Any]:
+    logger.debug(f"Aggregating {entity}: group_by={group_by}, metrics={metrics}, filter={filter}")
+    query_dict = None
+    if filter:
+        try:
+            query_dict = json.loads(filter)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid filter JSON format")
+
+    service = AggregateService(db)
+    group_fields = parse_fields(group_by) or []
+    try:
+        items = await service.aggregate(
+            entity, group_fields, metrics, query_dict=query_dict, user_id=user_id, limit=limit, labels=labels
+        )
+        return {"entity": entity, "group_by": group_fields, "items": items}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error aggregating {entity}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get(
+    "/{entity}",
+    response_model=AggregateResponse,
+    dependencies=[Depends(conditional_get("{entity}", "config_provinces"))],
+)
+async def aggregate_entity(
+    entity: str,
+    group_by: str = Query(None, description="Comma-separated fields to group by, e.g. anno,provincia"),
+    metrics: str = Query("count:*", description="Comma-separated fn:field pairs (sum, avg, min, max, count)"),
+    filter: str = Query(None, description="Filter conditions (JSON string, same operators as entity queries)"),
+    limit: int = Query(1000, ge=1, le=10000, description="Max number of groups to return"),
+    labels: bool = Query(False, description="Add provincia_name from the user's province configuration"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Aggregate an entity with SQL GROUP BY (user can only see their own records)"""
+    return await _run_aggregate(
+        db, entity, group_by, metrics, filter, limit, user_id=str(current_user.id), labels=labels
+    )
+
+
+@router.get(
+    "/{entity}/all",
+    response_model=AggregateResponse,
+    dependencies=[Depends(conditional_get("{entity}", public=True))],
+)
+async def aggregate_entity_all(
+    entity: str,
+    group_by: str = Query(None, description="Comma-separated fields to group by, e.g. anno,provincia"),
+    metrics: str = Query("count:*", description="Comma-separated fn:field pairs (sum, avg, min, max, count)"),
+    filter: str = Query(None, description="Filter conditions (JSON string, same operators as entity queries)"),
+    limit: int = Query(1000, ge=1, le=10000, description="Max number of groups to return"),
+    db: AsyncSession = Depends(get_db),
+):
+    # Aggregate an entity without user limitation, mirroring the entity /all routes
+    return await _run_aggregate(db, entity, group_by, metrics, filter, limit)
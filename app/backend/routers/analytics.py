@@ -0,0 +1,38 @@
+import logging
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from dependencies.auth import get_current_user
+from schemas.auth import UserResponse
+from services.analytics import AnalyticsService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"])
+
+
+class ExtractionByComuneResponse(BaseModel):
+    """Extracted volume allocated to comuni, largest first"""
+    anno: int
+    items: List[Dict[str, Any]]
+
+
+@router.get("/extraction-by-comune", response_model=ExtractionByComuneResponse)
+async def extraction_by_comune(
+    anno: int = Query(..., description="Year to allocate"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Allocate each province's extraction volume to its quarries and total it per comune"""
+    logger.debug(f"Computing extraction by comune for {anno}")
+    service = AnalyticsService(db)
+    try:
+        items = await service.extraction_by_comune(str(current_user.id), anno)
+        return {"anno": anno, "items": items}
+    except Exception as e:
+        logger.error(f"Error computing extraction by comune: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
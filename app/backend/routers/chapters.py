@@ -0,0 +1,49 @@
+import logging
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from dependencies.auth import get_current_user
+from schemas.auth import UserResponse
+from services.chapters import ChapterService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/chapters", tags=["chapters"])
+
+
+class ChapterReplaceRequest(BaseModel):
+    """Full dataset of a chapter-year, keyed by table name"""
+    tables: Dict[str, List[Dict[str, Any]]]
+
+
+class ChapterReplaceResponse(BaseModel):
+    """Rows deleted and inserted per table"""
+    chapter: str
+    anno: int
+    tables: Dict[str, Dict[str, int]]
+
+
+@router.put("/{chapter}/{anno}", response_model=ChapterReplaceResponse)
+async def replace_chapter_year(
+    chapter: str,
+    anno: int,
+    data: ChapterReplaceRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Atomically replace a chapter-year with the given rows (user's own records only)"""
+    logger.debug(f"Replacing {chapter} {anno}: {', '.join(data.tables)}")
+    service = ChapterService(db)
+    try:
+        summary = await service.replace_year(chapter, anno, data.tables, str(current_user.id))
+        return {"chapter": chapter, "anno": anno, "tables": summary}
+    except ValueError as e:
+        logger.error(f"Validation error replacing {chapter} {anno}: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error replacing {chapter} {anno}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -5,17 +5,9 @@ from pydantic import BaseModel
 from core.database import get_db
 from dependencies.auth import get_current_user
 from schemas.auth import UserResponse
-from models.annual_cave_data import Annual_cave_data
-from models.cave_details import Cave_details
-from models.province_material_data import Province_material_data
-from models.active_caves_data import Active_caves_data
-from models.extraction_data import Extraction_data
-from models.sales_data import Sales_data
-from models.economic_data import Economic_data
-from models.employment_data import Employment_data
-from models.price_data import Price_data
-from models.destination_data import Destination_data
-from models.competitor_data import Competitor_data
+from models.registry import CHAPTER_MODELS
+from services.invalidation import commit_changes
+from services.rollups import refresh_rollup_scope
 
 router = APIRouter(prefix="/api/v1/data-reset", tags=["data-reset"])
 
@@ -33,23 +25,10 @@ async def reset_data(
 ):
     """Reset data for a specific chapter and year"""
     try:
-        chapter_map = {
-            "cave_autorizzate": [Annual_cave_data, Cave_details, Province_material_data],
-            "cave_attive": [Active_caves_data],
-            "estrazioni": [Extraction_data],
-            "vendite": [Sales_data],
-            "dati_economici": [Economic_data],
-            "occupazione": [Employment_data],
-            "prezzi": [Price_data],
-            "destinazioni": [Destination_data],
-            "concorrenti": [Competitor_data],
-            "incassi_regionali": [Regional_revenue_data]
-        }
-        
-        if data.chapter not in chapter_map:
+        if data.chapter not in CHAPTER_MODELS:
             raise HTTPException(status_code=400, detail="Invalid chapter")
         
-        models = chapter_map[data.chapter]
+        models = CHAPTER_MODELS[data.chapter]
         deleted_count = 0
         
         for model in models:
@@ -60,8 +39,9 @@ async def reset_data(
                 )
             )
             deleted_count += result.rowcount
+            await refresh_rollup_scope(db, model, user_id=current_user.id, anno=data.anno)
         
-        await db.commit()
+        await commit_changes(db, [model.__tablename__ for model in models], str(current_user.id))
         
         return {
             "success": True,
@@ -9,6 +9,9 @@ from typing import List, Dict, Any
 from core.database import get_db
 from dependencies.auth import get_current_user
 from schemas.auth import UserResponse
+from models.registry import ENTITY_MODELS
+from services.invalidation import commit_changes
+from services.rollups import get_rollup
 
 router = APIRouter(prefix="/api/v1/db-admin", tags=["db-admin"])
 
@@ -143,7 +146,11 @@ async def truncate_table(
     """Truncate (delete all data from) a specific table"""
     try:
         await db.execute(text(f"TRUNCATE TABLE {table_name} CASCADE"))
-        await db.commit()
+        # Chapter tables: their summary rows would otherwise outlive the data
+        rollup = get_rollup(ENTITY_MODELS.get(table_name))
+        if rollup is not None:
+            await db.execute(text(f"TRUNCATE TABLE {rollup.__tablename__}"))
+        await commit_changes(db, [table_name])
         
         return {
             "success": True,
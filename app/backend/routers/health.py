@@ -1,5 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from dependencies.auth import get_current_user
+from schemas.auth import UserResponse
 from services.database import check_database_health
+from utils.cache import query_cache
 
 router = APIRouter(prefix="/database", tags=["database"])
 
@@ -9,3 +12,9 @@ async def database_health_check():
     """Check database connection health"""
     is_healthy = await check_database_health()
     return {"status": "healthy" if is_healthy else "unhealthy", "service": "database"}
+
+
+@router.get("/cache")
+async def query_cache_stats(current_user: UserResponse = Depends(get_current_user)):
+    """Hit/miss counters of the in-process entity list cache"""
+    return query_cache.stats()
@@ -0,0 +1,56 @@
+import logging
+from typing import List
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from dependencies.auth import get_current_user
+from schemas.auth import UserResponse
+from services.imports import ImportService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/import", tags=["import"])
+
+
+class ImportRowError(BaseModel):
+    """A spreadsheet row that was skipped"""
+    row: int
+    error: str
+
+
+class ImportResponse(BaseModel):
+    """Outcome of a spreadsheet import"""
+    anno: int
+    inserted: int
+    deleted: int
+    errors: List[ImportRowError]
+    elapsed_seconds: float
+    rows_per_second: int
+
+
+@router.post("/cave_details", response_model=ImportResponse)
+async def import_cave_details(
+    anno: int = Form(..., description="Year the register refers to"),
+    file: UploadFile = File(..., description="Cave_Autorizzate_*.xlsx register"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Replace the year's cave_details with the rows of an authorized-quarry register"""
+    logger.debug(f"Importing cave_details for {anno} from {file.filename}")
+    if file.filename and not file.filename.lower().endswith(".xlsx"):
+        raise HTTPException(status_code=400, detail="Only .xlsx files are supported")
+
+    service = ImportService(db)
+    try:
+        return await service.import_cave_details(file.file, anno, str(current_user.id))
+    except ValueError as e:
+        logger.error(f"Validation error importing cave_details: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error importing cave_details: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    finally:
+        await file.close()
@@ -0,0 +1,45 @@
+import logging
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from dependencies.auth import get_current_user
+from dependencies.etag import conditional_get
+from schemas.auth import UserResponse
+from services.indicators import IndicatorsService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/indicators", tags=["indicators"])
+
+
+class IndicatorsResponse(BaseModel):
+    """Indicators grouped by year or by year and material"""
+    by: str
+    items: List[Dict[str, Any]]
+
+
+@router.get(
+    "",
+    response_model=IndicatorsResponse,
+    dependencies=[Depends(conditional_get("economic_data", "employment_data", "sales_data"))],
+)
+async def get_indicators(
+    by: str = Query("anno", description="Grouping: 'anno' or 'anno,materiale'"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Compute economic indicators server-side (user can only see their own records)"""
+    logger.debug(f"Computing indicators by {by}")
+    service = IndicatorsService(db)
+    try:
+        items = await service.get_indicators(str(current_user.id), by=by)
+        return {"by": by, "items": items}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error computing indicators: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
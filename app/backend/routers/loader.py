@@ -0,0 +1,60 @@
+import io
+import logging
+from typing import List
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from dependencies.auth import get_current_user
+from schemas.auth import UserResponse
+from services.loader import LoaderService, detect_format
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/load", tags=["load"])
+
+
+class LoadLineError(BaseModel):
+    """A record that was skipped"""
+    line: int
+    error: str
+
+
+class LoadResponse(BaseModel):
+    """Outcome of a bulk load"""
+    entity: str
+    loaded: int
+    error_count: int
+    errors: List[LoadLineError]
+    elapsed_seconds: float
+    rows_per_second: int
+
+
+@router.post("/{entity}", response_model=LoadResponse)
+async def load_entity(
+    entity: str,
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON (one object per line)"),
+    format: str = Form(None, description="csv or ndjson (default: from the file extension)"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Bulk load a CSV/NDJSON file into an entity table as the user's records"""
+    logger.debug(f"Loading {file.filename} into {entity}")
+    service = LoaderService(db)
+    stream = None
+    try:
+        fmt = detect_format(file.filename, format)
+        stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        return await service.load(entity, stream, fmt, str(current_user.id))
+    except ValueError as e:
+        logger.error(f"Validation error loading {entity}: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error loading {entity}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    finally:
+        if stream is not None:
+            stream.detach()
+        await file.close()
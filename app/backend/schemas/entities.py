@@ -0,0 +1,13 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class ProjectedListResponse(BaseModel):
+    """List response for requests with `fields`: items only carry the selected columns"""
+
+    items: List[Dict[str, Any]]
+    total: Optional[int] = None
+    skip: int
+    limit: int
+    next_cursor: Optional[str] = None
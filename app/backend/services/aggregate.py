@@ -0,0 +1,136 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, Numeric, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.registry import get_entity_model
+from services.config import ConfigService
+from services.rollups import ROLLUP_KEYS, get_rollup, rollup_fields
+from utils.query import build_filters
+
+logger = logging.getLogger(__name__)
+
+AGGREGATE_FUNCTIONS = {
+    "sum": func.sum,
+    "avg": func.avg,
+    "min": func.min,
+    "max": func.max,
+    "count": func.count,
+}
+NUMERIC_ONLY = ("sum", "avg")
+
+
+def _metric_specs(metrics: str) -> List[Tuple[str, str]]:
+    """Split 'sum:volume_m3,count:id' into (function, field) pairs"""
+    return [spec.partition(":")[::2] for spec in [m.strip() for m in metrics.split(",") if m.strip()]]
+
+
+def parse_metrics(model, metrics: str) -> List[Any]:
+    """Parse 'sum:volume_m3,count:id' into labelled aggregate expressions"""
+    expressions = []
+    for fn_name, field in _metric_specs(metrics):
+        if fn_name not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Unknown aggregate '{fn_name}', expected one of {', '.join(AGGREGATE_FUNCTIONS)}")
+        if fn_name == "count" and field in ("", "*"):
+            expressions.append(func.count().label("count"))
+            continue
+        if field not in model.__table__.columns:
+            raise ValueError(f"Unknown field '{field}' for {model.__name__}")
+        column = getattr(model, field)
+        if fn_name in NUMERIC_ONLY and not isinstance(column.type, (Integer, Float, Numeric)):
+            raise ValueError(f"Aggregate '{fn_name}' needs a numeric field, '{field}' is not")
+        expression = AGGREGATE_FUNCTIONS[fn_name](column)
+        if fn_name == "sum":
+            # 0 rather than NULL over an empty scope, like count (and the rollup path)
+            expression = func.coalesce(expression, 0)
+        expressions.append(expression.label(f"{fn_name}_{field}"))
+    if not expressions:
+        raise ValueError("At least one metric is required")
+    return expressions
+
+
+def rollup_metrics(model, rollup, metrics: str) -> Optional[List[Any]]:
+    """The same metrics computed from a rollup table, or None when it cannot answer them
+
+    count -> sum(row_count) (chapter measures are NOT NULL, so count:field is the row count),
+    sum   -> sum of the group sums,
+    avg   -> sum of the group sums / sum(row_count).
+    min and max are not kept in the rollups. Counts and sums of an empty scope are 0, as
+    they are on the base table.
+    """
+    fields = rollup_fields(rollup)
+    expressions = []
+    for fn_name, field in _metric_specs(metrics):
+        if fn_name == "count" and field in ("", "*"):
+            expressions.append(func.coalesce(func.sum(rollup.row_count), 0).label("count"))
+        elif fn_name == "count" and not model.__table__.columns[field].nullable:
+            expressions.append(func.coalesce(func.sum(rollup.row_count), 0).label(f"count_{field}"))
+        elif fn_name == "sum" and field in fields:
+            expressions.append(func.coalesce(func.sum(getattr(rollup, field)), 0).label(f"sum_{field}"))
+        elif fn_name == "avg" and field in fields:
+            average = cast(func.sum(getattr(rollup, field)), Float) / func.sum(rollup.row_count)
+            expressions.append(average.label(f"avg_{field}"))
+        else:
+            return None
+    return expressions
+
+
+# ------------------ Service Layer ------------------
+class AggregateService:
+    """GROUP BY aggregation over any entity table"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def aggregate(
+        self,
+        entity: str,
+        group_by: Optional[List[str]],
+        metrics: str,
+        query_dict: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None,
+        limit: int = 1000,
+        labels: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Return one row per group with the requested metrics
+
+        Chapters with a rollup table are answered from it whenever the grouping, filters
+        and metrics only involve the rollup keys and sums; otherwise the base table is scanned.
+        With `labels` (and a user) groups by provincia also get the configured provincia_name.
+        """
+        model = get_entity_model(entity)
+        for field in group_by or []:
+            if field not in model.__table__.columns:
+                raise ValueError(f"Unknown field '{field}' for {model.__name__}")
+        expressions = parse_metrics(model, metrics)
+        filters = build_filters(model, query_dict) if query_dict else []
+
+        source = model
+        rollup = get_rollup(model)
+        if rollup is not None and set(group_by or []) | set(query_dict or {}) <= set(ROLLUP_KEYS):
+            rollup_expressions = rollup_metrics(model, rollup, metrics)
+            if rollup_expressions is not None:
+                source, expressions = rollup, rollup_expressions
+                filters = build_filters(rollup, query_dict) if query_dict else []
+
+        group_columns = [getattr(source, field) for field in group_by or []]
+        query = select(*group_columns, *expressions)
+        if user_id:
+            query = query.where(source.user_id == user_id)
+        if filters:
+            query = query.where(*filters)
+        if group_columns:
+            query = query.group_by(*group_columns).order_by(*group_columns)
+
+        try:
+            result = await self.db.execute(query.limit(limit))
+            items = [dict(row) for row in result.mappings()]
+            if labels and user_id and "provincia" in (group_by or []):
+                lookups = await ConfigService.get_lookups(self.db, user_id)
+                for item in items:
+                    item["provincia_name"] = lookups.province_name(item["provincia"])
+            return items
+        except Exception as e:
+            logger.error(f"Error aggregating {entity}: {str(e)}")
+            raise
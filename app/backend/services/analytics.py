@@ -0,0 +1,63 @@
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.cave_details import Cave_details
+from models.extraction_data import Extraction_data
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------ Service Layer ------------------
+class AnalyticsService:
+    """Cross-table analytics computed in the database"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def extraction_by_comune(self, user_id: str, anno: int) -> List[Dict[str, Any]]:
+        """Split each province's extracted volume evenly across its quarries and total it per comune
+
+        One statement joins cave_details to the per-province extraction totals and divides by
+        the number of quarries in the province (a window count); grouping by comune is a
+        single pass over the result. Comuni are sorted by volume, largest first.
+        """
+        province_volume = (
+            select(Extraction_data.provincia, func.sum(Extraction_data.volume_m3).label("volume_m3"))
+            .where(Extraction_data.user_id == user_id, Extraction_data.anno == anno)
+            .group_by(Extraction_data.provincia)
+            .subquery()
+        )
+        quarries_in_province = func.count().over(partition_by=Cave_details.provincia)
+        query = (
+            select(
+                *Cave_details.__table__.columns,
+                (province_volume.c.volume_m3 / quarries_in_province).label("volume_estratto"),
+            )
+            .join(province_volume, province_volume.c.provincia == Cave_details.provincia)
+            .where(Cave_details.user_id == user_id, Cave_details.anno == anno)
+        )
+
+        try:
+            result = await self.db.execute(query)
+            rows = result.mappings().all()
+        except Exception as e:
+            logger.error(f"Error computing extraction by comune for {anno}: {str(e)}")
+            raise
+
+        comuni: Dict[tuple, Dict[str, Any]] = {}
+        for row in rows:
+            key = (row["comune"], row["provincia"])
+            entry = comuni.get(key)
+            if entry is None:
+                entry = comuni[key] = {
+                    "comune": row["comune"],
+                    "provincia": row["provincia"],
+                    "volume_m3": 0.0,
+                    "dettagli": [],
+                }
+            entry["volume_m3"] += row["volume_estratto"] or 0
+            entry["dettagli"].append(dict(row))
+        return sorted(comuni.values(), key=lambda c: c["volume_m3"], reverse=True)
@@ -0,0 +1,76 @@
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.registry import get_chapter_models
+from services.invalidation import commit_changes
+from services.rollups import refresh_rollup_scope
+from utils.bulk import bulk_insert, delete_where
+from utils.validation import coerce_row
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------ Service Layer ------------------
+class ChapterService:
+    """Whole chapter-year operations spanning the chapter's tables"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def replace_year(
+        self, chapter: str, anno: int, tables: Dict[str, List[Dict[str, Any]]], user_id: str
+    ) -> Dict[str, Dict[str, int]]:
+        """Swap in the user's full dataset of a chapter-year in a single transaction
+
+        Every table named in `tables` is cleared for (user_id, anno) and reloaded with the
+        given rows (an empty list just clears it); tables of the chapter that are not named
+        are left alone. Readers see either the old or the new year, never a mix, because the
+        deletes, inserts and rollup refreshes commit together.
+        """
+        models = {model.__tablename__: model for model in get_chapter_models(chapter)}
+        unknown = [t for t in tables if t not in models]
+        if unknown:
+            raise ValueError(f"Table(s) not in chapter '{chapter}': {', '.join(unknown)}")
+        if not tables:
+            raise ValueError(f"No tables given, expected some of {', '.join(models)}")
+
+        # Validate everything before touching the database
+        rows = {}
+        for table, items in tables.items():
+            model = models[table]
+            rows[table] = []
+            for index, item in enumerate(items):
+                # Rows may leave anno out; a given one is compared once converted ("2023" == 2023)
+                overrides = {"user_id": user_id}
+                if item.get("anno") in (None, ""):
+                    overrides["anno"] = anno
+                try:
+                    row = coerce_row(model, item, overrides=overrides)
+                except ValueError as e:
+                    raise ValueError(f"{table}[{index}]: {e}")
+                if row["anno"] != anno:
+                    raise ValueError(f"{table}[{index}]: anno {item['anno']!r} does not match {anno}")
+                rows[table].append(row)
+
+        summary = {}
+        try:
+            for table, items in rows.items():
+                model = models[table]
+                deleted = await delete_where(self.db, model, [model.user_id == user_id, model.anno == anno])
+                created = await bulk_insert(self.db, model, items)
+                await refresh_rollup_scope(self.db, model, user_id=user_id, anno=anno)
+                summary[table] = {"deleted": len(deleted), "inserted": len(created)}
+            await commit_changes(self.db, rows, user_id)
+        except IntegrityError as e:
+            await self.db.rollback()
+            logger.warning(f"Constraint violation replacing {chapter} {anno}: {str(e.orig)}")
+            raise ValueError(f"Duplicate natural key or missing required field: {e.orig}")
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error replacing {chapter} {anno}: {str(e)}")
+            raise
+        logger.info(f"Replaced {chapter} {anno}: {summary}")
+        return summary
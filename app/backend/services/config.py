@@ -1,19 +1,70 @@
 from datetime import datetime
+from typing import Dict, FrozenSet, Optional, Tuple
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.config import ConfigProvince, ConfigMaterial, ConfigPriceMaterial, ConfigForeignDestination
+from services.invalidation import commit_changes
+from utils.cache import cache_key, query_cache
+
+
+async def _cached_rows(db: AsyncSession, model, user_id: str) -> Tuple:
+    """The user's rows of a config table, served from the query cache while the table is unchanged"""
+    table, user_id = model.__tablename__, str(user_id)
+    key = cache_key(table, user_id, "config")
+    version = query_cache.version(table, user_id)
+    rows = query_cache.get(key)
+    if rows is None:
+        result = await db.execute(select(model).where(model.user_id == user_id))
+        rows = tuple(result.scalars().all())
+        query_cache.put(key, version, rows)
+    return rows
+
+
+class ConfigLookups:
+    """A user's configuration tables as in-memory lookups, for validation and display names"""
+
+    def __init__(self, provinces, materials, price_materials, foreign_destinations):
+        self.provinces: Dict[str, str] = {p.code: p.name for p in provinces}  # code -> name
+        self.materials: FrozenSet[str] = frozenset(m.name for m in materials)
+        # price class -> general material
+        self.price_materials: Dict[str, str] = {m.name: m.general_material for m in price_materials}
+        self.foreign_destinations: FrozenSet[str] = frozenset(d.country for d in foreign_destinations)
+        self._province_codes = {
+            **{name.casefold(): code for code, name in self.provinces.items()},
+            **{code.casefold(): code for code in self.provinces},
+        }
+        self._materials = {name.casefold(): name for name in self.materials}
+
+    def province_name(self, code: str) -> str:
+        """Full name of a province code (the code itself when not configured)"""
+        return self.provinces.get(code, code)
+
+    def province_code(self, value: str) -> Optional[str]:
+        """Configured code for a province code or full name, case-insensitive; None if unknown"""
+        return self._province_codes.get(value.strip().casefold())
+
+    def material(self, value: str) -> Optional[str]:
+        """Configured spelling of a material name, case-insensitive; None if unknown"""
+        return self._materials.get(value.strip().casefold())
 
 
 class ConfigService:
     """Service for managing configuration data"""
 
+    @staticmethod
+    async def get_lookups(db: AsyncSession, user_id: str) -> ConfigLookups:
+        """All config tables of the user as lookups; no query once they are cached"""
+        return ConfigLookups(
+            await _cached_rows(db, ConfigProvince, user_id),
+            await _cached_rows(db, ConfigMaterial, user_id),
+            await _cached_rows(db, ConfigPriceMaterial, user_id),
+            await _cached_rows(db, ConfigForeignDestination, user_id),
+        )
+
     # Province Management
     @staticmethod
     async def get_provinces(db: AsyncSession, user_id: str):
-        result = await db.execute(
-            select(ConfigProvince).where(ConfigProvince.user_id == user_id)
-        )
-        return result.scalars().all()
+        return list(await _cached_rows(db, ConfigProvince, user_id))
 
     @staticmethod
     async def create_province(db: AsyncSession, user_id: str, code: str, name: str):
@@ -24,7 +75,7 @@ class ConfigService:
             created_at=datetime.now()
         )
         db.add(province)
-        await db.commit()
+        await commit_changes(db, [ConfigProvince.__tablename__], user_id)
         await db.refresh(province)
         return province
 
@@ -36,15 +87,12 @@ class ConfigService:
                 ConfigProvince.user_id == user_id
             )
         )
-        await db.commit()
+        await commit_changes(db, [ConfigProvince.__tablename__], user_id)
 
     # Material Management
     @staticmethod
     async def get_materials(db: AsyncSession, user_id: str):
-        result = await db.execute(
-            select(ConfigMaterial).where(ConfigMaterial.user_id == user_id)
-        )
-        return result.scalars().all()
+        return list(await _cached_rows(db, ConfigMaterial, user_id))
 
     @staticmethod
     async def create_material(db: AsyncSession, user_id: str, name: str):
@@ -54,7 +102,7 @@ class ConfigService:
             created_at=datetime.now()
         )
         db.add(material)
-        await db.commit()
+        await commit_changes(db, [ConfigMaterial.__tablename__], user_id)
         await db.refresh(material)
         return material
 
@@ -66,15 +114,12 @@ class ConfigService:
                 ConfigMaterial.user_id == user_id
             )
         )
-        await db.commit()
+        await commit_changes(db, [ConfigMaterial.__tablename__], user_id)
 
     # Price Material Management
     @staticmethod
     async def get_price_materials(db: AsyncSession, user_id: str):
-        result = await db.execute(
-            select(ConfigPriceMaterial).where(ConfigPriceMaterial.user_id == user_id)
-        )
-        return result.scalars().all()
+        return list(await _cached_rows(db, ConfigPriceMaterial, user_id))
 
     @staticmethod
     async def create_price_material(db: AsyncSession, user_id: str, name: str, general_material: str):
@@ -85,7 +130,7 @@ class ConfigService:
             created_at=datetime.now()
         )
         db.add(price_material)
-        await db.commit()
+        await commit_changes(db, [ConfigPriceMaterial.__tablename__], user_id)
         await db.refresh(price_material)
         return price_material
 
@@ -97,15 +142,12 @@ class ConfigService:
                 ConfigPriceMaterial.user_id == user_id
             )
         )
-        await db.commit()
+        await commit_changes(db, [ConfigPriceMaterial.__tablename__], user_id)
 
     # Foreign Destination Management
     @staticmethod
     async def get_foreign_destinations(db: AsyncSession, user_id: str):
-        result = await db.execute(
-            select(ConfigForeignDestination).where(ConfigForeignDestination.user_id == user_id)
-        )
-        return result.scalars().all()
+        return list(await _cached_rows(db, ConfigForeignDestination, user_id))
 
     @staticmethod
     async def create_foreign_destination(db: AsyncSession, user_id: str, country: str):
@@ -115,7 +157,7 @@ class ConfigService:
             created_at=datetime.now()
         )
         db.add(destination)
-        await db.commit()
+        await commit_changes(db, [ConfigForeignDestination.__tablename__], user_id)
         await db.refresh(destination)
         return destination
 
@@ -127,4 +169,4 @@ class ConfigService:
                 ConfigForeignDestination.user_id == user_id
             )
         )
-        await db.commit()
\ No newline at end of file
+        await commit_changes(db, [ConfigForeignDestination.__tablename__], user_id)
\ No newline at end of file
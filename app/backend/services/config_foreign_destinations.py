@@ -1,10 +1,17 @@
 import logging
 from typing import Optional, Dict, Any, List
 
-from sqlalchemy import select, func
+from sqlalchemy import exists, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.config_foreign_destinations import Config_foreign_destinations
+from services.invalidation import commit_changes
+from services.rollups import load_rollup_groups, refresh_rollup_groups, rollup_columns, rollup_groups
+from utils.bulk import bulk_delete, bulk_insert, bulk_update, bulk_upsert, delete_where
+from utils.cache import cache_key, query_cache
+from utils.pagination import apply_cursor, apply_sort, encode_cursor, fetch_page
+from utils.query import build_filters, project_columns
 
 logger = logging.getLogger(__name__)
 
@@ -21,33 +28,91 @@ class Config_foreign_destinationsService:
         try:
             if user_id:
                 data['user_id'] = user_id
-            obj = Config_foreign_destinations(**data)
-            self.db.add(obj)
-            await self.db.commit()
-            await self.db.refresh(obj)
+            result = await self.db.execute(
+                insert(Config_foreign_destinations).values(**data).returning(Config_foreign_destinations)
+            )
+            obj = result.scalar_one()
+            await refresh_rollup_groups(self.db, Config_foreign_destinations, rollup_groups(Config_foreign_destinations, [obj]))
+            await commit_changes(self.db, [Config_foreign_destinations.__tablename__], user_id)
             logger.info(f"Created config_foreign_destinations with id: {obj.id}")
             return obj
+        except IntegrityError as e:
+            await self.db.rollback()
+            logger.warning(f"Constraint violation creating config_foreign_destinations: {str(e.orig)}")
+            raise ValueError(f"Duplicate natural key or missing required field: {e.orig}")
         except Exception as e:
             await self.db.rollback()
             logger.error(f"Error creating config_foreign_destinations: {str(e)}")
             raise
 
+    async def create_many(self, items: List[Dict[str, Any]], user_id: Optional[str] = None) -> List[Config_foreign_destinations]:
+        """Create many config_foreign_destinationss in one transaction (all or nothing)"""
+        try:
+            if user_id:
+                items = [{**data, 'user_id': user_id} for data in items]
+            objs = await bulk_insert(self.db, Config_foreign_destinations, items)
+            await refresh_rollup_groups(self.db, Config_foreign_destinations, rollup_groups(Config_foreign_destinations, objs))
+            await commit_changes(self.db, [Config_foreign_destinations.__tablename__], user_id)
+            logger.info(f"Created {len(objs)} config_foreign_destinationss")
+            return objs
+        except IntegrityError as e:
+            await self.db.rollback()
+            logger.warning(f"Constraint violation creating config_foreign_destinationss: {str(e.orig)}")
+            raise ValueError(f"Duplicate natural key or missing required field: {e.orig}")
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error creating config_foreign_destinationss: {str(e)}")
+            raise
+
+    async def upsert_many(self, items: List[Dict[str, Any]], user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Insert or update config_foreign_destinationss by natural key in one transaction"""
+        try:
+            if user_id:
+                items = [{**data, 'user_id': user_id} for data in items]
+            rows = await bulk_upsert(self.db, Config_foreign_destinations, items)
+            await refresh_rollup_groups(self.db, Config_foreign_destinations, rollup_groups(Config_foreign_destinations, rows))
+            await commit_changes(self.db, [Config_foreign_destinations.__tablename__], user_id)
+            logger.info(f"Upserted {len(rows)} config_foreign_destinationss")
+            return rows
+        except IntegrityError as e:
+            await self.db.rollback()
+            logger.warning(f"Constraint violation upserting config_foreign_destinationss: {str(e.orig)}")
+            raise ValueError(f"Duplicate natural key or missing required field: {e.orig}")
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error upserting config_foreign_destinationss: {str(e)}")
+            raise
+
     async def check_ownership(self, obj_id: int, user_id: str) -> bool:
         """Check if user owns this record"""
         try:
-            obj = await self.get_by_id(obj_id, user_id=user_id)
-            return obj is not None
+            query = select(
+                exists().where(Config_foreign_destinations.id == obj_id, Config_foreign_destinations.user_id == user_id)
+            )
+            return bool(await self.db.scalar(query))
         except Exception as e:
             logger.error(f"Error checking ownership for config_foreign_destinations {obj_id}: {str(e)}")
             return False
 
-    async def get_by_id(self, obj_id: int, user_id: Optional[str] = None) -> Optional[Config_foreign_destinations]:
-        """Get config_foreign_destinations by ID (user can only see their own records)"""
+    async def get_by_id(
+        self, obj_id: int, user_id: Optional[str] = None, fields: Optional[List[str]] = None
+    ) -> Optional[Config_foreign_destinations]:
+        """Get config_foreign_destinations by ID (user can only see their own records)
+
+        With `fields` only those columns are selected and a plain dict is returned.
+        """
         try:
-            query = select(Config_foreign_destinations).where(Config_foreign_destinations.id == obj_id)
+            if fields:
+                query = select(*project_columns(Config_foreign_destinations, fields))
+            else:
+                query = select(Config_foreign_destinations)
+            query = query.where(Config_foreign_destinations.id == obj_id)
             if user_id:
                 query = query.where(Config_foreign_destinations.user_id == user_id)
             result = await self.db.execute(query)
+            if fields:
+                row = result.mappings().one_or_none()
+                return dict(row) if row else None
             return result.scalar_one_or_none()
         except Exception as e:
             logger.error(f"Error fetching config_foreign_destinations {obj_id}: {str(e)}")
@@ -60,10 +125,31 @@ class Config_foreign_destinationsService:
         user_id: Optional[str] = None,
         query_dict: Optional[Dict[str, Any]] = None,
         sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count: str = "exact",
+        fields: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
-        """Get paginated list of config_foreign_destinationss (user can only see their own records)"""
+        """Get paginated list of config_foreign_destinationss (user can only see their own records)
+
+        When `cursor` is given the page seeks on (sort field, id) and `skip` is ignored.
+        `count` is one of exact, estimate or none (see utils.pagination.fetch_page).
+        With `fields` only those columns (plus id and the sort field) are selected and
+        items are plain dicts instead of ORM instances. Results are served from the
+        process-wide query cache until a write to the table bumps its version.
+        """
         try:
-            query = select(Config_foreign_destinations)
+            key = cache_key(
+                Config_foreign_destinations.__tablename__, user_id, query_dict, sort, skip, limit, cursor, count, fields
+            )
+            version = query_cache.version(Config_foreign_destinations.__tablename__, user_id)
+            cached = query_cache.get(key)
+            if cached is not None:
+                return cached
+
+            if fields:
+                query = select(*project_columns(Config_foreign_destinations, fields, sort))
+            else:
+                query = select(Config_foreign_destinations)
             count_query = select(func.count(Config_foreign_destinations.id))
             
             if user_id:
@@ -71,58 +157,90 @@ class Config_foreign_destinationsService:
                 count_query = count_query.where(Config_foreign_destinations.user_id == user_id)
             
             if query_dict:
-                for field, value in query_dict.items():
-                    if hasattr(Config_foreign_destinations, field):
-                        query = query.where(getattr(Config_foreign_destinations, field) == value)
-                        count_query = count_query.where(getattr(Config_foreign_destinations, field) == value)
+                for condition in build_filters(Config_foreign_destinations, query_dict):
+                    query = query.where(condition)
+                    count_query = count_query.where(condition)
             
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar()
-
-            if sort:
-                if sort.startswith('-'):
-                    field_name = sort[1:]
-                    if hasattr(Config_foreign_destinations, field_name):
-                        query = query.order_by(getattr(Config_foreign_destinations, field_name).desc())
-                else:
-                    if hasattr(Config_foreign_destinations, sort):
-                        query = query.order_by(getattr(Config_foreign_destinations, sort))
+            query = apply_sort(query, Config_foreign_destinations, sort)
+            if cursor:
+                query = apply_cursor(query, Config_foreign_destinations, sort, cursor)
             else:
-                query = query.order_by(Config_foreign_destinations.id.desc())
+                query = query.offset(skip)
 
-            result = await self.db.execute(query.offset(skip).limit(limit))
-            items = result.scalars().all()
+            items, total = await fetch_page(
+                self.db, query, count_query, limit, count=count, skip=skip, cursor=cursor, projected=bool(fields)
+            )
+            next_cursor = encode_cursor(Config_foreign_destinations, sort, items[-1]) if len(items) == limit else None
 
-            return {
+            result = {
                 "items": items,
                 "total": total,
                 "skip": skip,
                 "limit": limit,
+                "next_cursor": next_cursor,
             }
+            query_cache.put(key, version, result)
+            return result
         except Exception as e:
             logger.error(f"Error fetching config_foreign_destinations list: {str(e)}")
             raise
 
     async def update(self, obj_id: int, update_data: Dict[str, Any], user_id: Optional[str] = None) -> Optional[Config_foreign_destinations]:
-        """Update config_foreign_destinations (requires ownership)"""
+        """Update config_foreign_destinations in a single UPDATE ... RETURNING (requires ownership)"""
         try:
-            obj = await self.get_by_id(obj_id, user_id=user_id)
+            columns = Config_foreign_destinations.__table__.columns
+            values = {k: v for k, v in update_data.items() if k in columns and k not in ('id', 'user_id')}
+            if not values:
+                return await self.get_by_id(obj_id, user_id=user_id)
+
+            # The old group only needs loading when a rollup key column changes
+            groups = set()
+            if values.keys() & set(rollup_columns(Config_foreign_destinations)):
+                groups = await load_rollup_groups(self.db, Config_foreign_destinations, [obj_id], user_id=user_id)
+
+            query = update(Config_foreign_destinations).where(Config_foreign_destinations.id == obj_id)
+            if user_id:
+                query = query.where(Config_foreign_destinations.user_id == user_id)
+            result = await self.db.execute(query.values(**values).returning(Config_foreign_destinations))
+            obj = result.scalar_one_or_none()
             if not obj:
+                await self.db.rollback()
                 logger.warning(f"Config_foreign_destinations {obj_id} not found for update")
                 return None
-            for key, value in update_data.items():
-                if hasattr(obj, key) and key != 'user_id':
-                    setattr(obj, key, value)
 
-            await self.db.commit()
-            await self.db.refresh(obj)
+            await refresh_rollup_groups(self.db, Config_foreign_destinations, groups | rollup_groups(Config_foreign_destinations, [obj]))
+            await commit_changes(self.db, [Config_foreign_destinations.__tablename__], user_id)
             logger.info(f"Updated config_foreign_destinations {obj_id}")
             return obj
+        except IntegrityError as e:
+            await self.db.rollback()
+            logger.warning(f"Constraint violation updating config_foreign_destinations {obj_id}: {str(e.orig)}")
+            raise ValueError(f"Duplicate natural key or missing required field: {e.orig}")
         except Exception as e:
             await self.db.rollback()
             logger.error(f"Error updating config_foreign_destinations {obj_id}: {str(e)}")
             raise
 
+    async def update_many(
+        self, updates: Dict[int, Dict[str, Any]], user_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Update many config_foreign_destinationss (id -> changes) set-based in one transaction (requires ownership)"""
+        try:
+            groups = await load_rollup_groups(self.db, Config_foreign_destinations, updates, user_id=user_id)
+            rows = await bulk_update(self.db, Config_foreign_destinations, updates, user_id=user_id)
+            await refresh_rollup_groups(self.db, Config_foreign_destinations, groups | rollup_groups(Config_foreign_destinations, rows))
+            await commit_changes(self.db, [Config_foreign_destinations.__tablename__], user_id)
+            logger.info(f"Updated {len(rows)} config_foreign_destinationss")
+            return rows
+        except IntegrityError as e:
+            await self.db.rollback()
+            logger.warning(f"Constraint violation updating config_foreign_destinationss: {str(e.orig)}")
+            raise ValueError(f"Duplicate natural key or missing required field: {e.orig}")
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error updating config_foreign_destinationss: {str(e)}")
+            raise
+
     async def delete(self, obj_id: int, user_id: Optional[str] = None) -> bool:
         """Delete config_foreign_destinations (requires ownership)"""
         try:
@@ -130,8 +248,11 @@ class Config_foreign_destinationsService:
             if not obj:
                 logger.warning(f"Config_foreign_destinations {obj_id} not found for deletion")
                 return False
+            groups = rollup_groups(Config_foreign_destinations, [obj])
             await self.db.delete(obj)
-            await self.db.commit()
+            await self.db.flush()
+            await refresh_rollup_groups(self.db, Config_foreign_destinations, groups)
+            await commit_changes(self.db, [Config_foreign_destinations.__tablename__], user_id)
             logger.info(f"Deleted config_foreign_destinations {obj_id}")
             return True
         except Exception as e:
@@ -139,6 +260,39 @@ class Config_foreign_destinationsService:
             logger.error(f"Error deleting config_foreign_destinations {obj_id}: {str(e)}")
             raise
 
+    async def delete_many(self, ids: List[int], user_id: Optional[str] = None) -> List[int]:
+        """Delete many config_foreign_destinationss in a single statement (requires ownership)"""
+        try:
+            rows = await bulk_delete(
+                self.db, Config_foreign_destinations, ids, user_id=user_id, returning=rollup_columns(Config_foreign_destinations)
+            )
+            await refresh_rollup_groups(self.db, Config_foreign_destinations, rollup_groups(Config_foreign_destinations, rows))
+            await commit_changes(self.db, [Config_foreign_destinations.__tablename__], user_id)
+            logger.info(f"Deleted {len(rows)} config_foreign_destinationss")
+            return [row["id"] for row in rows]
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error deleting config_foreign_destinationss: {str(e)}")
+            raise
+
+    async def delete_by_query(self, query_dict: Dict[str, Any], user_id: Optional[str] = None) -> int:
+        """Delete every config_foreign_destinations matching `query_dict` in a single statement (user's own records only)"""
+        try:
+            conditions = build_filters(Config_foreign_destinations, query_dict)
+            if user_id:
+                conditions.append(Config_foreign_destinations.user_id == user_id)
+            rows = await delete_where(
+                self.db, Config_foreign_destinations, conditions, returning=rollup_columns(Config_foreign_destinations)
+            )
+            await refresh_rollup_groups(self.db, Config_foreign_destinations, rollup_groups(Config_foreign_destinations, rows))
+            await commit_changes(self.db, [Config_foreign_destinations.__tablename__], user_id)
+            logger.info(f"Deleted {len(rows)} config_foreign_destinationss matching {query_dict}")
+            return len(rows)
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error deleting config_foreign_destinationss matching {query_dict}: {str(e)}")
+            raise
+
     async def get_by_field(self, field_name: str, field_value: Any) -> Optional[Config_foreign_destinations]:
         """Get config_foreign_destinations by any field"""
         try:
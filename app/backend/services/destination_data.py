@@ -1,10 +1,17 @@
 import logging
 from typing import Optional, Dict, Any, List
 
-from sqlalchemy import select, func
+from sqlalchemy import exists, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.destination_data import Destination_data
+from services.invalidation import commit_changes
+from services.rollups import load_rollup_groups, refresh_rollup_groups, rollup_columns, rollup_groups
+from utils.bulk import bulk_delete, bulk_insert, bulk_update, bulk_upsert, delete_where
+from utils.cache import cache_key, query_cache
+from utils.pagination import apply_cursor, apply_sort, encode_cursor, fetch_page
+from utils.query import build_filters, project_columns
 
 logger = logging.getLogger(__name__)
 
@@ -21,33 +28,91 @@ class Destination_dataService:
         try:
             if user_id:
                 data['user_id'] = user_id
-            obj = Destination_data(**data)
-            self.db.add(obj)
-            await self.db.commit()
-            await self.db.refresh(obj)
+            result = await self.db.execute(
+                insert(Destination_data).values(**data).returning(Destination_data)
+            )
+            obj = result.scalar_one()
+            await refresh_rollup_groups(self.db, Destination_data, rollup_groups(Destination_data, [obj]))
+            await commit_changes(self.db, [Destination_data.__tablename__], user_id)
             logger.info(f"Created destination_data with id: {obj.id}")
             return obj
+        except IntegrityError as e:
+            await self.db.rollback()
+            logger.warning(f"Constraint violation creating destination_data: {str(e.orig)}")
+            raise ValueError(f"Duplicate natural key or missing required field: {e.orig}")
         except Exception as e:
             await self.db.rollback()
             logger.error(f"Error creating destination_data: {str(e)}")
             raise
 
+    async def create_many(self, items: List[Dict[str, Any]], user_id: Optional[str] = None) -> List[Destination_data]:
+        """Create many destination_datas in one transaction (all or nothing)"""
+        try:
+            if user_id:
+                items = [{**data, 'user_id': user_id} for data in items]
+            objs = await bulk_insert(self.db, Destination_data, items)
+            await refresh_rollup_groups(self.db, Destination_data, rollup_groups(Destination_data, objs))
+            await commit_changes(self.db, [Destination_data.__tablename__], user_id)
+            logger.info(f"Created {len(objs)} destination_datas")
+            return objs
+        except IntegrityError as e:
+            await self.db.rollback()
+            logger.warning(f"Constraint violation creating destination_datas: {str(e.orig)}")
+            raise ValueError(f"Duplicate natural key or missing required field: {e.orig}")
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error creating destination_datas: {str(e)}")
+            raise
+
+    async def upsert_many(self, items: List[Dict[str, Any]], user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Insert or update destination_datas by natural key in one transaction"""
+        try:
+            if user_id:
+                items = [{**data, 'user_id': user_id} for data in items]
+            rows = await bulk_upsert(self.db, Destination_data, items)
+            await refresh_rollup_groups(self.db, Destination_data, rollup_groups(Destination_data, rows))
+            await commit_changes(self.db, [Destination_data.__tablename__], user_id)
+            logger.info(f"Upserted {len(rows)} destination_datas")
+            return rows
+        except IntegrityError as e:
+            await self.db.rollback()
+            logger.warning(f"Constraint violation upserting destination_datas: {str(e.orig)}")
+            raise ValueError(f"Duplicate natural key or missing required field: {e.orig}")
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error upserting destination_datas: {str(e)}")
+            raise
+
     async def check_ownership(self, obj_id: int, user_id: str) -> bool:
         """Check if user owns this record"""
         try:
-            obj = await self.get_by_id(obj_id, user_id=user_id)
-            return obj is not None
+            query = select(
+                exists().where(Destination_data.id == obj_id, Destination_data.user_id == user_id)
+            )
+            return bool(await self.db.scalar(query))
         except Exception as e:
             logger.error(f"Error checking ownership for destination_data {obj_id}: {str(e)}")
             return False
 
-    async def get_by_id(self, obj_id: int, user_id: Optional[str] = None) -> Optional[Destination_data]:
-        """Get destination_data by ID (user can only see their own records)"""
+    async def get_by_id(
+        self, obj_id: int, user_id: Optional[str] = None, fields: Optional[List[str]] = None
+    ) -> Optional[Destination_data]:
+        """Get destination_data by ID (user can only see their own records)
+
+        With `fields` only those columns are selected and a plain dict is returned.
+        """
         try:
-            query = select(Destination_data).where(Destination_data.id == obj_id)
+            if fields:
+                query = select(*project_columns(Destination_data, fields))
+            else:
+                query = select(Destination_data)
+            query = query.where(Destination_data.id == obj_id)
             if user_id:
                 query = query.where(Destination_data.user_id == user_id)
             result = await self.db.execute(query)
+            if fields:
+                row = result.mappings().one_or_none()
+                return dict(row) if row else None
             return result.scalar_one_or_none()
         except Exception as e:
             logger.error(f"Error fetching destination_data {obj_id}: {str(e)}")
@@ -60,10 +125,31 @@ class Destination_dataService:
         user_id: Optional[str] = None,
         query_dict: Optional[Dict[str, Any]] = None,
         sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count: str = "exact",
+        fields: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
-        """Get paginated list of destination_datas (user can only see their own records)"""
+        """Get paginated list of destination_datas (user can only see their own records)
+
+        When `cursor` is given the page seeks on (sort field, id) and `skip` is ignored.
+        `count` is one of exact, estimate or none (see utils.pagination.fetch_page).
+        With `fields` only those columns (plus id and the sort field) are selected and
+        items are plain dicts instead of ORM instances. Results are served from the
+        process-wide query cache until a write to the table bumps its version.
+        """
         try:
-            query = select(Destination_data)
+            key = cache_key(
+                Destination_data.__tablename__, user_id, query_dict, sort, skip, limit, cursor, count, fields
+            )
+            version = query_cache.version(Destination_data.__tablename__, user_id)
+            cached = query_cache.get(key)
+            if cached is not None:
+                return cached
+
+            if fields:
+                query = select(*project_columns(Destination_data, fields, sort))
+            else:
+                query = select(Destination_data)
             count_query = select(func.count(Destination_data.id))
             
             if user_id:
@@ -71,58 +157,90 @@ class Destination_dataService:
                 count_query = count_query.where(Destination_data.user_id == user_id)
             
             if query_dict:
-                for field, value in query_dict.items():
-                    if hasattr(Destination_data, field):
-                        query = query.where(getattr(Destination_data, field) == value)
-                        count_query = count_query.where(getattr(Destination_data, field) == value)
+                for condition in build_filters(Destination_data, query_dict):
+                    query = query.where(condition)
+                    count_query = count_query.where(condition)
             
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar()
-
-            if sort:
-                if sort.startswith('-'):
-                    field_name = sort[1:]
-                    if hasattr(Destination_data, field_name):
-                        query = query.order_by(getattr(Destination_data, field_name).desc())
-                else:
-                    if hasattr(Destination_data, sort):
-                        query = query.order_by(getattr(Destination_data, sort))
+            query = apply_sort(query, Destination_data, sort)
+            if cursor:
+                query = apply_cursor(query, Destination_data, sort, cursor)
             else:
-                query = query.order_by(Destination_data.id.desc())
+                query = query.offset(skip)
 
-            result = await self.db.execute(query.offset(skip).limit(limit))
-            items = result.scalars().all()
+            items, total = await fetch_page(
+                self.db, query, count_query, limit, count=count, skip=skip, cursor=cursor, projected=bool(fields)
+            )
+            next_cursor = encode_cursor(Destination_data, sort, items[-1]) if len(items) == limit else None
 
-            return {
+            result = {
                 "items": items,
                 "total": total,
                 "skip": skip,
                 "limit": limit,
+                "next_cursor": next_cursor,
             }
+            query_cache.put(key, version, result)
+            return result
         except Exception as e:
             logger.error(f"Error fetching destination_data list: {str(e)}")
             raise
 
     async def update(self, obj_id: int, update_data: Dict[str, Any], user_id: Optional[str] = None) -> Optional[Destination_data]:
-        """Update destination_data (requires ownership)"""
+        """Update destination_data in a single UPDATE ... RETURNING (requires ownership)"""
         try:
-            obj = await self.get_by_id(obj_id, user_id=user_id)
+            columns = Destination_data.__table__.columns
+            values = {k: v for k, v in update_data.items() if k in columns and k not in ('id', 'user_id')}
+            if not values:
+                return await self.get_by_id(obj_id, user_id=user_id)
+
+            # The old group only needs loading when a rollup key column changes
+            groups = set()
+            if values.keys() & set(rollup_columns(Destination_data)):
+                groups = await load_rollup_groups(self.db, Destination_data, [obj_id], user_id=user_id)
+
+            query = update(Destination_data).where(Destination_data.id == obj_id)
+            if user_id:
+                query = query.where(Destination_data.user_id == user_id)
+            result = await self.db.execute(query.values(**values).returning(Destination_data))
+            obj = result.scalar_one_or_none()
             if not obj:
+                await self.db.rollback()
                 logger.warning(f"Destination_data {obj_id} not found for update")
                 return None
-            for key, value in update_data.items():
-                if hasattr(obj, key) and key != 'user_id':
-                    setattr(obj, key, value)
 
-            await self.db.commit()
-            await self.db.refresh(obj)
+            await refresh_rollup_groups(self.db, Destination_data, groups | rollup_groups(Destination_data, [obj]))
+            await commit_changes(self.db, [Destination_data.__tablename__], user_id)
             logger.info(f"Updated destination_data {obj_id}")
             return obj
+        except IntegrityError as e:
+            await self.db.rollback()
+            logger.warning(f"Constraint violation updating destination_data {obj_id}: {str(e.orig)}")
+            raise ValueError(f"Duplicate natural key or missing required field: {e.orig}")
         except Exception as e:
             await self.db.rollback()
             logger.error(f"Error updating destination_data {obj_id}: {str(e)}")
             raise
 
+    async def update_many(
+        self, updates: Dict[int, Dict[str, Any]], user_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Update many destination_datas (id -> changes) set-based in one transaction (requires ownership)"""
+        try:
+            groups = await load_rollup_groups(self.db, Destination_data, updates, user_id=user_id)
+            rows = await bulk_update(self.db, Destination_data, updates, user_id=user_id)
+            await refresh_rollup_groups(self.db, Destination_data, groups | rollup_groups(Destination_data, rows))
+            await commit_changes(self.db, [Destination_data.__tablename__], user_id)
+            logger.info(f"Updated {len(rows)} destination_datas")
+            return rows
+        except IntegrityError as e:
+            await self.db.rollback()
+            logger.warning(f"Constraint violation updating destination_datas: {str(e.orig)}")
+            raise ValueError(f"Duplicate natural key or missing required field: {e.orig}")
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error updating destination_datas: {str(e)}")
+            raise
+
     async def delete(self, obj_id: int, user_id: Optional[str] = None) -> bool:
         """Delete destination_data (requires ownership)"""
         try:
@@ -130,8 +248,11 @@ class Destination_dataService:
             if not obj:
                 logger.warning(f"Destination_data {obj_id} not found for deletion")
                 return False
+            groups = rollup_groups(Destination_data, [obj])
             await self.db.delete(obj)
-            await self.db.commit()
+            await self.db.flush()
+            await refresh_rollup_groups(self.db, Destination_data, groups)
+            await commit_changes(self.db, [Destination_data.__tablename__], user_id)
             logger.info(f"Deleted destination_data {obj_id}")
             return True
         except Exception as e:
@@ -139,6 +260,39 @@ class Destination_dataService:
             logger.error(f"Error deleting destination_data {obj_id}: {str(e)}")
             raise
 
+    async def delete_many(self, ids: List[int], user_id: Optional[str] = None) -> List[int]:
+        """Delete many destination_datas in a single statement (requires ownership)"""
+        try:
+            rows = await bulk_delete(
+                self.db, Destination_data, ids, user_id=user_id, returning=rollup_columns(Destination_data)
+            )
+            await refresh_rollup_groups(self.db, Destination_data, rollup_groups(Destination_data, rows))
+            await commit_changes(self.db, [Destination_data.__tablename__], user_id)
+            logger.info(f"Deleted {len(rows)} destination_datas")
+            return [row["id"] for row in rows]
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error deleting destination_datas: {str(e)}")
+            raise
+
+    async def delete_by_query(self, query_dict: Dict[str, Any], user_id: Optional[str] = None) -> int:
+        """Delete every destination_data matching `query_dict` in a single statement (user's own records only)"""
+        try:
+            conditions = build_filters(Destination_data, query_dict)
+            if user_id:
+                conditions.append(Destination_data.user_id == user_id)
+            rows = await delete_where(
+                self.db, Destination_data, conditions, returning=rollup_columns(Destination_data)
+            )
+            await refresh_rollup_groups(self.db, Destination_data, rollup_groups(Destination_data, rows))
+            await commit_changes(self.db, [Destination_data.__tablename__], user_id)
+            logger.info(f"Deleted {len(rows)} destination_datas matching {query_dict}")
+            return len(rows)
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error deleting destination_datas matching {query_dict}: {str(e)}")
+            raise
+
     async def get_by_field(self, field_name: str, field_value: Any) -> Optional[Destination_data]:
         """Get destination_data by any field"""
         try:
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+import zipfile
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.cave_details import Cave_details
+from services.config import ConfigLookups, ConfigService
+from services.invalidation import commit_changes
+from utils.bulk import bulk_insert, delete_where
+
+logger = logging.getLogger(__name__)
+
+# Header in the Cave_Autorizzate_*.xlsx register -> cave_details column
+CAVE_DETAILS_COLUMNS = {
+    "Numero Fascicolo": "numero_fascicolo",
+    "Comune": "comune",
+    "Provincia": "provincia",
+    "Stato Cava": "stato_cava",
+    "Materiale": "materiale",
+}
+CAVE_DETAILS_REQUIRED = {"Comune": "comune", "Provincia": "provincia"}
+DEFAULT_STATO_CAVA = "AUTORIZZATA"
+
+
+def _text(value: Any) -> str:
+    """Cell value as trimmed text ('' for empty cells)"""
+    return "" if value is None else str(value).strip()
+
+
+def parse_cave_details_xlsx(
+    source: BinaryIO, anno: int, lookups: Optional[ConfigLookups] = None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Read the first sheet of an authorized-quarry register into cave_details rows
+
+    The workbook is opened read-only, so rows are streamed from the archive instead of
+    loading the whole sheet. Blocking: run it in a worker thread. Returns (rows, errors)
+    where each error carries the spreadsheet row number. With `lookups`, provinces (code or
+    full name) and materials are checked against the user's configuration and normalized to
+    the configured code/spelling; tables the user has not configured are not checked.
+    """
+    try:
+        workbook = load_workbook(source, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile, KeyError) as e:
+        raise ValueError(f"Not a valid xlsx file: {e}")
+
+    rows, errors = [], []
+    created_at = datetime.now(timezone.utc)
+    try:
+        sheet = workbook.worksheets[0]
+        positions = None
+        for row_number, values in enumerate(sheet.iter_rows(values_only=True), start=1):
+            if positions is None:
+                headers = [_text(v) for v in values]
+                positions = {CAVE_DETAILS_COLUMNS[h]: i for i, h in enumerate(headers) if h in CAVE_DETAILS_COLUMNS}
+                missing = [h for h, c in CAVE_DETAILS_REQUIRED.items() if c not in positions]
+                if missing:
+                    raise ValueError(f"Missing column(s) in the header row: {', '.join(missing)}")
+                continue
+            if all(v is None or _text(v) == "" for v in values):
+                continue
+
+            record = {c: _text(values[i]) if i < len(values) else "" for c, i in positions.items()}
+            empty = [h for h, c in CAVE_DETAILS_REQUIRED.items() if not record[c]]
+            if empty:
+                errors.append({"row": row_number, "error": f"Missing value for {', '.join(empty)}"})
+                continue
+            if lookups and lookups.provinces:
+                code = lookups.province_code(record["provincia"])
+                if code is None:
+                    errors.append({"row": row_number, "error": f"Unknown province '{record['provincia']}'"})
+                    continue
+                record["provincia"] = code
+            if lookups and lookups.materials and record.get("materiale"):
+                material = lookups.material(record["materiale"])
+                if material is None:
+                    errors.append({"row": row_number, "error": f"Unknown material '{record['materiale']}'"})
+                    continue
+                record["materiale"] = material
+            rows.append(
+                {
+                    "anno": anno,
+                    "numero_fascicolo": record.get("numero_fascicolo", ""),
+                    "comune": record["comune"],
+                    "provincia": record["provincia"],
+                    "stato_cava": record.get("stato_cava") or DEFAULT_STATO_CAVA,
+                    "materiale": record.get("materiale", ""),
+                    "azienda": "",
+                    "localita": "",
+                    "dati_catastali": "",
+                    "created_at": created_at,
+                }
+            )
+    finally:
+        workbook.close()
+
+    if positions is None:
+        raise ValueError("The workbook is empty")
+    return rows, errors
+
+
+# ------------------ Service Layer ------------------
+class ImportService:
+    """Server-side spreadsheet imports"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def import_cave_details(self, source: BinaryIO, anno: int, user_id: str) -> Dict[str, Any]:
+        """Replace the user's cave_details of `anno` with the rows of an xlsx register
+
+        Parsing runs in a worker thread; the delete and the bulk insert share one transaction,
+        so a failed import leaves the previous rows in place. Rows with errors (including
+        provinces/materials missing from the user's configuration) are skipped and reported.
+        """
+        started = time.perf_counter()
+        lookups = await ConfigService.get_lookups(self.db, user_id)
+        rows, errors = await asyncio.to_thread(parse_cave_details_xlsx, source, anno, lookups)
+        if not rows:
+            # Replacing the year with nothing is almost certainly a wrong or empty file
+            detail = f" ({len(errors)} rejected, e.g. row {errors[0]['row']}: {errors[0]['error']})" if errors else ""
+            raise ValueError(f"No valid rows to import{detail}")
+        for row in rows:
+            row["user_id"] = user_id
+
+        try:
+            deleted = await delete_where(
+                self.db, Cave_details, [Cave_details.user_id == user_id, Cave_details.anno == anno]
+            )
+            created = await bulk_insert(self.db, Cave_details, rows)
+            await commit_changes(self.db, [Cave_details.__tablename__], user_id)
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error importing cave_details for {anno}: {str(e)}")
+            raise
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Imported {len(created)} cave_details for {anno} in {elapsed:.2f}s ({len(errors)} errors)")
+        return {
+            "anno": anno,
+            "inserted": len(created),
+            "deleted": len(deleted),
+            "errors": errors,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(len(created) / elapsed) if elapsed else 0,
+        }
@@ -0,0 +1,101 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.economic_data import Economic_data
+from models.employment_data import Employment_data
+from models.sales_data import Sales_data
+from services.rollups import get_rollup
+
+logger = logging.getLogger(__name__)
+
+GROUPINGS = {
+    "anno": ["anno"],
+    "anno,materiale": ["anno", "materiale"],
+}
+
+
+def _ratio(numerator: Optional[float], denominator: Optional[float], scale: float = 1.0, digits: int = 2) -> float:
+    """numerator / denominator * scale, or 0 when the denominator is not positive"""
+    if not denominator or denominator <= 0:
+        return 0
+    return round((numerator or 0) / denominator * scale, digits)
+
+
+# ------------------ Service Layer ------------------
+class IndicatorsService:
+    """Economic KPIs joining economic, employment and sales data"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _grouped(self, model, keys: List[str], fields: List[str], user_id: str):
+        """Per-key sums of `fields` for one user, as a subquery over the chapter's rollup table"""
+        model = get_rollup(model) or model
+        key_columns = [getattr(model, k) for k in keys]
+        return (
+            select(*key_columns, *[func.sum(getattr(model, f)).label(f) for f in fields])
+            .where(model.user_id == user_id)
+            .group_by(*key_columns)
+            .subquery()
+        )
+
+    async def get_indicators(self, user_id: str, by: str = "anno") -> List[Dict[str, Any]]:
+        """Gross/net margin, revenue per employee and revenue per m³ grouped by `by`
+
+        Economic data drives the result (as on the Indicators page): employment and sales
+        are left-joined on the same keys and count as zero when missing.
+        """
+        if by not in GROUPINGS:
+            raise ValueError(f"Invalid grouping '{by}', expected one of {', '.join(GROUPINGS)}")
+        keys = GROUPINGS[by]
+
+        economic = self._grouped(Economic_data, keys, ["fatturato", "utile_lordo", "utile_netto"], user_id)
+        employment = self._grouped(Employment_data, keys, ["numero_occupati"], user_id)
+        sales = self._grouped(Sales_data, keys, ["volume_m3"], user_id)
+
+        query = (
+            select(
+                *[economic.c[k] for k in keys],
+                economic.c.fatturato,
+                economic.c.utile_lordo,
+                economic.c.utile_netto,
+                func.coalesce(employment.c.numero_occupati, 0).label("dipendenti"),
+                func.coalesce(sales.c.volume_m3, 0).label("vendite"),
+            )
+            .select_from(
+                economic.outerjoin(employment, and_(*[employment.c[k] == economic.c[k] for k in keys])).outerjoin(
+                    sales, and_(*[sales.c[k] == economic.c[k] for k in keys])
+                )
+            )
+            .order_by(*[economic.c[k] for k in keys])
+        )
+
+        try:
+            result = await self.db.execute(query)
+            rows = result.mappings().all()
+        except Exception as e:
+            logger.error(f"Error computing indicators: {str(e)}")
+            raise
+
+        indicators = []
+        for row in rows:
+            item = {k: row[k] for k in keys}
+            item.update(
+                {
+                    "label": " - ".join(str(row[k]) for k in keys),
+                    "fatturato": row["fatturato"],
+                    "utile_lordo": row["utile_lordo"],
+                    "utile_netto": row["utile_netto"],
+                    "dipendenti": row["dipendenti"],
+                    "vendite": row["vendite"],
+                    "margine_lordo": _ratio(row["utile_lordo"], row["fatturato"], 100),
+                    "margine_netto": _ratio(row["utile_netto"], row["fatturato"], 100),
+                    "fatturato_per_dipendente": _ratio(row["fatturato"], row["dipendenti"], digits=0),
+                    "fatturato_per_m3": _ratio(row["fatturato"], row["vendite"]),
+                }
+            )
+            indicators.append(item)
+        return indicators
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from core.database import db_manager
+from utils.cache import query_cache
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel; payloads are '<table>:<user_id>', or '<table>:*' for changes of every user
+CHANNEL = "table_changed"
+ALL_USERS = "*"
+KEEPALIVE_INTERVAL = 30.0  # seconds between liveness checks of the LISTEN connection
+POLL_INTERVAL = 2.0  # seconds between PRAGMA data_version polls on SQLite
+RECONNECT_DELAY = 5.0
+
+_listener_task: Optional[asyncio.Task] = None
+
+
+async def commit_changes(db: AsyncSession, tables: Iterable[str], user_id: Optional[str] = None) -> None:
+    """Commit the session's writes to `tables` and invalidate cached reads of them everywhere
+
+    On PostgreSQL a table_changed notification per table is queued in the same transaction,
+    so other instances hear about the change exactly when (and only if) it commits. The local
+    cache is bumped right after the commit so this instance reads its own writes.
+    """
+    tables = list(tables)
+    if db.bind.dialect.name == "postgresql":
+        for table in tables:
+            await db.execute(select(func.pg_notify(CHANNEL, f"{table}:{user_id or ALL_USERS}")))
+    await db.commit()
+    query_cache.bump(*tables, user_id=user_id)
+
+
+def _on_notification(connection, pid: int, channel: str, payload: str) -> None:
+    table, _, user_id = payload.partition(":")
+    query_cache.bump(table, user_id=None if user_id in ("", ALL_USERS) else user_id)
+
+
+async def _listen(conn: AsyncConnection) -> None:
+    """LISTEN on the asyncpg connection until it breaks"""
+    driver = (await conn.get_raw_connection()).driver_connection
+    await driver.add_listener(CHANNEL, _on_notification)
+    # Anything written while we were not listening is unknown
+    query_cache.bump_all()
+    query_cache.listening = True
+    logger.info(f"Listening for {CHANNEL} notifications")
+    try:
+        while True:
+            await asyncio.sleep(KEEPALIVE_INTERVAL)
+            await driver.execute("SELECT 1")
+    finally:
+        query_cache.listening = False
+        if not driver.is_closed():
+            await driver.remove_listener(CHANNEL, _on_notification)
+
+
+async def _poll(conn: AsyncConnection) -> None:
+    """Invalidate everything whenever another connection commits to the SQLite file
+
+    SQLite has no notifications; PRAGMA data_version changes on commits by any other
+    connection, which is all this fallback can tell.
+    """
+    last = None
+    query_cache.listening = True
+    try:
+        while True:
+            version = (await conn.exec_driver_sql("PRAGMA data_version")).scalar()
+            await conn.rollback()
+            if last is not None and version != last:
+                query_cache.bump_all()
+            last = version
+            await asyncio.sleep(POLL_INTERVAL)
+    finally:
+        query_cache.listening = False
+
+
+async def _run_listener() -> None:
+    dialect = db_manager.engine.dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        logger.info(f"No cache invalidation bus for {dialect}; relying on the cache TTL")
+        return
+    while True:
+        try:
+            async with db_manager.engine.connect() as conn:
+                await (_listen(conn) if dialect == "postgresql" else _poll(conn))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener failed, retrying in {RECONNECT_DELAY}s: {e}")
+            await asyncio.sleep(RECONNECT_DELAY)
+
+
+async def start_invalidation_listener():
+    """Start the background task evicting local cache entries on writes by other instances"""
+    global _listener_task
+    if not db_manager.engine:
+        logger.warning("Database engine is not ready; cache invalidation listener not started")
+        return
+    if _listener_task is None or _listener_task.done():
+        _listener_task = asyncio.create_task(_run_listener())
+
+
+async def stop_invalidation_listener():
+    """Cancel the listener task (before the engine is disposed)"""
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
@@ -6,6 +6,8 @@ from pathlib import Path
 from typing import Any, Iterable
 
 from core.database import db_manager
+from models.registry import ENTITY_MODELS
+from services.rollups import refresh_rollup_scope
 from sqlalchemy import Date, DateTime, MetaData, Table, func, select
 from sqlalchemy.exc import NoSuchTableError, SQLAlchemyError
 
@@ -148,6 +150,8 @@ async def _load_table_from_file(data_file: Path):
 
         try:
             await conn.execute(table.insert(), records)
+            if table_name in ENTITY_MODELS:
+                await refresh_rollup_scope(conn, ENTITY_MODELS[table_name])
             logger.info("Inserted %d mock records into %s", len(records), table_name)
         except SQLAlchemyError as exc:
             logger.error("Failed to insert mock data into %s: %s", table_name, exc)
@@ -0,0 +1,169 @@
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, exists, func, insert, select, true, tuple_
+from sqlalchemy.exc import IntegrityError
+
+from models.active_caves_data import Active_caves_data
+from models.economic_data import Economic_data
+from models.employment_data import Employment_data
+from models.extraction_data import Extraction_data
+from models.province_material_data import Province_material_data
+from models.rollups import (
+    Active_caves_data_rollup,
+    Economic_data_rollup,
+    Employment_data_rollup,
+    Extraction_data_rollup,
+    Province_material_data_rollup,
+    Sales_data_rollup,
+)
+from models.sales_data import Sales_data
+from utils.bulk import UPSERT_INSERTS
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_KEYS = ("user_id", "anno", "provincia", "materiale")
+GROUP_CHUNK_SIZE = 500
+
+# Chapter model -> summary table holding its per-group row count and sums
+ROLLUPS = {
+    Active_caves_data: Active_caves_data_rollup,
+    Economic_data: Economic_data_rollup,
+    Employment_data: Employment_data_rollup,
+    Extraction_data: Extraction_data_rollup,
+    Province_material_data: Province_material_data_rollup,
+    Sales_data: Sales_data_rollup,
+}
+
+
+def get_rollup(model):
+    """Summary model for a chapter model, or None when it has no rollup"""
+    return ROLLUPS.get(model)
+
+
+def rollup_fields(rollup) -> List[str]:
+    """Summed columns of a rollup table"""
+    return [c.name for c in rollup.__table__.columns if c.name not in ROLLUP_KEYS and c.name != "row_count"]
+
+
+def rollup_columns(model) -> Tuple[str, ...]:
+    """Columns needed to know which rollup groups a row belongs to (none without a rollup)"""
+    return ROLLUP_KEYS if model in ROLLUPS else ()
+
+
+def rollup_groups(model, rows: Iterable[Any]) -> Set[Tuple]:
+    """Rollup keys touched by `rows` (ORM instances or dicts), empty for models without a rollup"""
+    if model not in ROLLUPS:
+        return set()
+    return {
+        tuple(row[k] if isinstance(row, dict) else getattr(row, k) for k in ROLLUP_KEYS)
+        for row in rows
+    }
+
+
+async def load_rollup_groups(db, model, ids: Iterable[int], user_id: Optional[str] = None) -> Set[Tuple]:
+    """Rollup keys of the rows with the given ids, read before a set-based update or delete"""
+    if model not in ROLLUPS or not ids:
+        return set()
+    table = model.__table__
+    ids = list(ids)
+    groups = set()
+    for start in range(0, len(ids), GROUP_CHUNK_SIZE):
+        query = select(*[table.c[k] for k in ROLLUP_KEYS]).where(table.c.id.in_(ids[start:start + GROUP_CHUNK_SIZE]))
+        if user_id:
+            query = query.where(table.c.user_id == user_id)
+        result = await db.execute(query.distinct())
+        groups.update(tuple(row) for row in result.all())
+    return groups
+
+
+def _summarize(model, rollup, *conditions):
+    """SELECT of the per-group totals of `model` restricted by `conditions`"""
+    table = model.__table__
+    fields = rollup_fields(rollup)
+    keys = [table.c[k] for k in ROLLUP_KEYS]
+    return (
+        # SQLite needs a WHERE to parse INSERT ... SELECT ... ON CONFLICT
+        select(*keys, func.count().label("row_count"), *[func.sum(table.c[f]).label(f) for f in fields])
+        .where(true(), *conditions)
+        .group_by(*keys)
+    )
+
+
+async def _write_summary(db, model, base_conditions: List[Any], rollup_conditions: List[Any]) -> None:
+    """Bring the rollup rows matching `rollup_conditions` in line with the base table
+
+    Groups are upserted (INSERT ... SELECT ... ON CONFLICT DO UPDATE), so two transactions
+    refreshing the same group both succeed instead of racing on the rollup primary key; then
+    the groups left without base rows are deleted. Dialects without ON CONFLICT fall back to
+    delete + insert.
+    """
+    rollup = ROLLUPS[model]
+    table, summary_table = model.__table__, rollup.__table__
+    columns = [*ROLLUP_KEYS, "row_count", *rollup_fields(rollup)]
+    summary = _summarize(model, rollup, *base_conditions)
+    dialect = db.dialect.name if hasattr(db, "dialect") else db.bind.dialect.name
+    try:
+        if dialect not in UPSERT_INSERTS:
+            await db.execute(delete(summary_table).where(*rollup_conditions))
+            await db.execute(insert(summary_table).from_select(columns, summary))
+            return
+        statement = UPSERT_INSERTS[dialect](summary_table).from_select(columns, summary)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(ROLLUP_KEYS),
+            set_={c: statement.excluded[c] for c in columns if c not in ROLLUP_KEYS},
+        )
+        await db.execute(statement)
+        has_rows = exists().where(*[table.c[k] == summary_table.c[k] for k in ROLLUP_KEYS])
+        await db.execute(delete(summary_table).where(*rollup_conditions, ~has_rows))
+    except IntegrityError as e:
+        # Not the caller's natural key: keep it away from the services' "duplicate key" 400s
+        raise RuntimeError(f"Refreshing {summary_table.name} failed: {e.orig}") from e
+
+
+async def refresh_rollup_groups(db, model, groups: Set[Tuple]) -> None:
+    """Recompute the given (user_id, anno, provincia, materiale) groups from the base table
+
+    Runs inside the caller's transaction, so the summary commits (or rolls back) together
+    with the write that touched it. Only the affected groups are read, through the
+    (user_id, anno, provincia, materiale) index. `db` may be a session or a connection;
+    pending ORM changes must be flushed first.
+    """
+    rollup = ROLLUPS.get(model)
+    if rollup is None or not groups:
+        return
+    base_keys = tuple_(*[model.__table__.c[k] for k in ROLLUP_KEYS])
+    rollup_keys = tuple_(*[rollup.__table__.c[k] for k in ROLLUP_KEYS])
+    groups = sorted(groups)
+    for start in range(0, len(groups), GROUP_CHUNK_SIZE):
+        chunk = groups[start:start + GROUP_CHUNK_SIZE]
+        await _write_summary(db, model, [base_keys.in_(chunk)], [rollup_keys.in_(chunk)])
+
+
+async def refresh_rollup_scope(db, model, user_id: Optional[str] = None, anno: Optional[int] = None) -> None:
+    """Recompute every group of a user and/or year; with neither, rebuild the whole table"""
+    rollup = ROLLUPS.get(model)
+    if rollup is None:
+        return
+    base_conditions, rollup_conditions = [], []
+    if user_id is not None:
+        base_conditions.append(model.__table__.c.user_id == user_id)
+        rollup_conditions.append(rollup.__table__.c.user_id == user_id)
+    if anno is not None:
+        base_conditions.append(model.__table__.c.anno == anno)
+        rollup_conditions.append(rollup.__table__.c.anno == anno)
+    await _write_summary(db, model, base_conditions, rollup_conditions)
+
+
+async def rebuild_rollups(db, models: Optional[Iterable[Any]] = None) -> Dict[str, int]:
+    """Rebuild rollup tables from scratch (backfills, repairs); returns groups per table"""
+    counts = {}
+    for model in models or ROLLUPS:
+        rollup = ROLLUPS.get(model)
+        if rollup is None:
+            raise ValueError(f"{model.__name__} has no rollup table")
+        await refresh_rollup_scope(db, model)
+        result = await db.execute(select(func.count()).select_from(rollup.__table__))
+        counts[rollup.__tablename__] = result.scalar()
+        logger.info(f"Rebuilt {rollup.__tablename__}: {counts[rollup.__tablename__]} groups")
+    return counts
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import Base, get_db  # noqa: E402
+from dependencies.auth import get_current_user  # noqa: E402
+from schemas.auth import UserResponse  # noqa: E402
+from utils.cache import query_cache  # noqa: E402
+
+
+def create_schema(conn):
+    """Create every mapped table; indexes one by one with checkfirst, since the config
+    tables are declared both in models/config.py and models/config_*.py and so carry
+    their id index twice"""
+    for table in Base.metadata.sorted_tables:
+        conn.execute(CreateTable(table))
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    """Session on a throwaway in-memory SQLite database"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(create_schema)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def api(db_session):
+    """Factory for a client of an app mounting `routers`, on db_session and signed in as `user_id`"""
+    clients = []
+
+    def make_client(*routers, user_id: str = "u1") -> httpx.AsyncClient:
+        app = FastAPI()
+        for router in routers:
+            app.include_router(router)
+        app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_current_user] = lambda: UserResponse(id=user_id, email=f"{user_id}@example.com")
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        clients.append(client)
+        return client
+
+    yield make_client
+    for client in clients:
+        await client.aclose()
+
+
+@pytest.fixture(autouse=True)
+def fresh_query_cache():
+    """Every test gets its own database, so nothing cached by an earlier one may leak in"""
+    query_cache.bump_all()
+    yield
+    query_cache.bump_all()
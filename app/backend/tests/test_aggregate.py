@@ -0,0 +1,96 @@
+import pytest
+
+from routers.aggregate import router as aggregate_router
+from services import aggregate
+from services.aggregate import AggregateService
+from services.extraction_data import Extraction_dataService
+
+ROWS = [
+    (2020, "BA", "Calcare", 10.0),
+    (2020, "BA", "Argilla", 2.5),
+    (2020, "LE", "Calcare", 4.0),
+    (2021, "BA", "Calcare", 7.0),
+]
+
+
+async def seed(db):
+    await Extraction_dataService(db).create_many(
+        [{"anno": a, "provincia": p, "materiale": m, "volume_m3": v} for a, p, m, v in ROWS], user_id="u1"
+    )
+
+
+async def both_paths(db, monkeypatch, **kwargs):
+    """The same aggregate answered from the rollup and from the base table"""
+    service = AggregateService(db)
+    from_rollup = await service.aggregate("extraction_data", user_id="u1", **kwargs)
+    with monkeypatch.context() as patch:
+        patch.setattr(aggregate, "get_rollup", lambda model: None)
+        from_base = await service.aggregate("extraction_data", user_id="u1", **kwargs)
+    return from_rollup, from_base
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "group_by, query_dict",
+    [
+        (None, None),
+        (["anno"], None),
+        (["anno", "provincia"], {"materiale": "Calcare"}),
+        (["provincia"], {"anno": {"$gte": 2021}}),
+        (None, {"anno": 1999}),
+    ],
+)
+async def test_rollup_and_base_table_agree(db_session, monkeypatch, group_by, query_dict):
+    await seed(db_session)
+    from_rollup, from_base = await both_paths(
+        db_session, monkeypatch, group_by=group_by, query_dict=query_dict,
+        metrics="count,count:volume_m3,sum:volume_m3,avg:volume_m3",
+    )
+    assert from_rollup == from_base
+
+
+@pytest.mark.asyncio
+async def test_empty_scope_counts_and_sums_are_zero(db_session, monkeypatch):
+    for items in await both_paths(db_session, monkeypatch, group_by=None, metrics="count,sum:volume_m3,avg:volume_m3"):
+        assert items == [{"count": 0, "sum_volume_m3": 0, "avg_volume_m3": None}]
+
+
+@pytest.mark.asyncio
+async def test_aggregate_endpoint(db_session, api):
+    await seed(db_session)
+    response = await api(aggregate_router).get(
+        "/api/v1/aggregate/extraction_data",
+        params={"group_by": "anno", "metrics": "count,min:volume_m3,max:volume_m3", "filter": '{"provincia": "BA"}'},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "entity": "extraction_data",
+        "group_by": ["anno"],
+        "items": [
+            {"anno": 2020, "count": 2, "min_volume_m3": 2.5, "max_volume_m3": 10.0},
+            {"anno": 2021, "count": 1, "min_volume_m3": 7.0, "max_volume_m3": 7.0},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_aggregates_only_see_the_users_rows(db_session, api):
+    await seed(db_session)
+    response = await api(aggregate_router, user_id="u2").get("/api/v1/aggregate/extraction_data")
+    assert response.json()["items"] == [{"count": 0}]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "entity, params, message",
+    [
+        ("nope", {}, "Unknown entity"),
+        ("extraction_data", {"metrics": "median:volume_m3"}, "Unknown aggregate"),
+        ("extraction_data", {"metrics": "sum:provincia"}, "needs a numeric field"),
+        ("extraction_data", {"group_by": "colore"}, "Unknown field"),
+    ],
+)
+async def test_invalid_aggregates_are_bad_requests(api, entity, params, message):
+    response = await api(aggregate_router).get(f"/api/v1/aggregate/{entity}", params=params)
+    assert response.status_code == 400
+    assert message in response.json()["detail"]
@@ -0,0 +1,114 @@
+import pytest
+
+from routers.extraction_data import router
+from services.extraction_data import Extraction_dataService
+
+URL = "/api/v1/entities/extraction_data"
+
+
+async def seed(db):
+    """Ids of two rows of the same (anno, provincia)"""
+    rows = await Extraction_dataService(db).create_many(
+        [
+            {"anno": 2020, "provincia": "BA", "materiale": "Calcare", "volume_m3": 1.0},
+            {"anno": 2020, "provincia": "BA", "materiale": "Argilla", "volume_m3": 2.0},
+        ],
+        user_id="u1",
+    )
+    return [row.id for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_batch_update_onto_an_existing_natural_key_is_a_bad_request(db_session, api):
+    calcare, argilla = await seed(db_session)
+    client = api(router)
+
+    single = await client.put(f"{URL}/{argilla}", json={"materiale": "Calcare"})
+    batch = await client.put(f"{URL}/batch", json={"items": [{"id": argilla, "updates": {"materiale": "Calcare"}}]})
+    assert single.status_code == batch.status_code == 400
+    assert "Duplicate natural key" in batch.json()["detail"]
+
+    # The failed batch changed nothing
+    rows = (await client.get(URL, params={"sort": "id"})).json()["items"]
+    assert [row["materiale"] for row in rows] == ["Calcare", "Argilla"]
+
+
+@pytest.mark.asyncio
+async def test_batch_update_applies_partial_changes(db_session, api):
+    calcare, argilla = await seed(db_session)
+    response = await api(router).put(
+        f"{URL}/batch",
+        json={"items": [{"id": argilla, "updates": {"volume_m3": 5.0}}, {"id": calcare, "updates": {"anno": 2021}}]},
+    )
+    assert response.status_code == 200, response.text
+    assert [(row["id"], row["anno"], row["volume_m3"]) for row in response.json()] == [
+        (argilla, 2020, 5.0), (calcare, 2021, 1.0)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_upsert_constraint_violation_is_a_validation_error(db_session):
+    with pytest.raises(ValueError, match="Duplicate natural key or missing required field"):
+        await Extraction_dataService(db_session).upsert_many(
+            [{"anno": 2020, "provincia": "BA", "materiale": "Calcare", "volume_m3": None}], user_id="u1"
+        )
+
+
+@pytest.mark.asyncio
+async def test_upsert_returns_rows_in_input_order(db_session, api):
+    await seed(db_session)
+    items = [
+        {"anno": 2021, "provincia": "LE", "materiale": "Calcare", "volume_m3": 9.0},
+        {"anno": 2020, "provincia": "BA", "materiale": "Argilla", "volume_m3": 3.0},
+        {"anno": 2019, "provincia": "TA", "materiale": "Calcare", "volume_m3": 4.0},
+        {"anno": 2020, "provincia": "BA", "materiale": "Calcare", "volume_m3": 7.0},
+        {"anno": 2021, "provincia": "LE", "materiale": "Calcare", "volume_m3": 8.0},
+    ]
+    response = await api(router).post(f"{URL}/upsert", json={"items": items})
+    assert response.status_code == 200, response.text
+    assert [(row["anno"], row["materiale"], row["volume_m3"]) for row in response.json()] == [
+        (2021, "Calcare", 8.0), (2020, "Argilla", 3.0), (2019, "Calcare", 4.0), (2020, "Calcare", 7.0)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_create_is_all_or_nothing(api):
+    client = api(router)
+    items = [
+        {"anno": 2020, "provincia": "BA", "materiale": "Calcare", "volume_m3": 1.0},
+        {"anno": 2021, "provincia": "BA", "materiale": "Calcare", "volume_m3": 2.0},
+    ]
+    created = await client.post(f"{URL}/batch", json={"items": items})
+    assert created.status_code == 201, created.text
+    assert [(row["anno"], row["user_id"]) for row in created.json()] == [(2020, "u1"), (2021, "u1")]
+
+    clash = await client.post(f"{URL}/batch", json={"items": [{**items[0], "anno": 2022}, items[1]]})
+    assert clash.status_code == 400
+    assert (await client.get(URL)).json()["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_delete_only_removes_own_rows(db_session, api):
+    calcare, argilla = await seed(db_session)
+    response = await api(router, user_id="u2").request("DELETE", f"{URL}/batch", json={"ids": [calcare]})
+    assert response.json()["deleted_count"] == 0
+
+    response = await api(router).request("DELETE", f"{URL}/batch", json={"ids": [calcare, argilla, 999]})
+    assert response.status_code == 200
+    assert response.json()["deleted_count"] == 2
+    assert (await api(router).get(URL)).json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_delete_by_filter(db_session, api):
+    await seed(db_session)
+    client = api(router)
+    await client.post(URL, json={"anno": 2021, "provincia": "LE", "materiale": "Calcare", "volume_m3": 3.0})
+
+    assert (await client.delete(URL)).status_code == 400
+    response = await client.delete(URL, params={"anno": 2020, "query": '{"materiale": {"$in": ["Argilla"]}}'})
+    assert response.json()["deleted_count"] == 1
+    response = await client.delete(URL, params={"anno": 2020})
+    assert response.json()["deleted_count"] == 1
+    rows = (await client.get(URL)).json()["items"]
+    assert [(row["anno"], row["provincia"]) for row in rows] == [(2021, "LE")]
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import pytest
+
+import utils.cache as cache_module
+from services.extraction_data import Extraction_dataService
+from utils.cache import QueryCache, cache_key, query_cache
+
+
+def test_user_writes_only_invalidate_that_user_and_all_user_reads():
+    cache = QueryCache()
+    mine, theirs, everyone = cache_key("t", "u1", 1), cache_key("t", "u2", 1), cache_key("t", None, 1)
+    for key in (mine, theirs, everyone):
+        cache.put(key, cache.version("t", key[1]), key)
+
+    cache.bump("t", user_id="u1")
+    assert cache.get(mine) is None
+    assert cache.get(everyone) is None
+    assert cache.get(theirs) == theirs
+
+    cache.bump("t")
+    assert cache.get(theirs) is None
+
+
+def test_results_computed_during_a_write_are_not_stored():
+    cache = QueryCache()
+    key = cache_key("t", "u1", "page")
+    version = cache.version("t", "u1")
+    cache.bump("t", user_id="u1")  # committed while the query was running
+    cache.put(key, version, "stale")
+    assert cache.get(key) is None
+
+
+def test_entries_expire_and_are_evicted(monkeypatch):
+    cache = QueryCache(max_entries=2, ttl=10)
+    for i in range(3):
+        cache.put(cache_key("t", "u1", i), 0, i)
+    assert cache.get(cache_key("t", "u1", 0)) is None
+    assert cache.evictions == 1
+
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    cache.put(cache_key("t", "u1", "ttl"), 0, "value")
+    now[0] += 11
+    assert cache.get(cache_key("t", "u1", "ttl")) is None
+
+
+@pytest.mark.asyncio
+async def test_list_results_are_cached_until_a_write(db_session):
+    service = Extraction_dataService(db_session)
+    item = {"anno": 2020, "provincia": "BA", "materiale": "Calcare", "volume_m3": 1.0}
+    await service.create(item, user_id="u1")
+
+    first = await service.get_list(user_id="u1")
+    hits = query_cache.hits
+    assert await service.get_list(user_id="u1") is first
+    assert query_cache.hits == hits + 1
+
+    await service.create({**item, "anno": 2021}, user_id="u1")
+    assert (await service.get_list(user_id="u1"))["total"] == 2
@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import select
+
+from models.extraction_data import Extraction_data
+from services.chapters import ChapterService
+
+
+def row(anno, materiale="Calcare", **extra):
+    return {"anno": anno, "provincia": "BA", "materiale": materiale, "volume_m3": 1.0, **extra}
+
+
+async def stored(db):
+    result = await db.execute(select(Extraction_data.anno, Extraction_data.materiale).order_by(Extraction_data.id))
+    return [tuple(r) for r in result.all()]
+
+
+@pytest.mark.asyncio
+async def test_replace_year_accepts_converted_and_missing_anno(db_session):
+    service = ChapterService(db_session)
+    await service.replace_year("estrazioni", 2023, {"extraction_data": [row(2023, "Argilla")]}, "u1")
+
+    rows = [row("2023"), row(2023.0, "Sabbia"), {k: v for k, v in row(None, "Ghiaia").items() if k != "anno"}]
+    summary = await service.replace_year("estrazioni", 2023, {"extraction_data": rows}, "u1")
+    assert summary == {"extraction_data": {"deleted": 1, "inserted": 3}}
+    assert await stored(db_session) == [(2023, "Calcare"), (2023, "Sabbia"), (2023, "Ghiaia")]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("anno, message", [("2022", "does not match 2023"), (2022, "does not match 2023"), ("x", "Invalid value")])
+async def test_replace_year_rejects_other_years(db_session, anno, message):
+    with pytest.raises(ValueError, match=message):
+        await ChapterService(db_session).replace_year("estrazioni", 2023, {"extraction_data": [row(anno)]}, "u1")
+    assert await stored(db_session) == []
@@ -0,0 +1,86 @@
+import base64
+import gzip
+
+import brotli
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from core.compression import CompressionMiddleware, choose_encoding
+from lambda_handler import ensure_base64_encoded_body
+
+ROWS = [{"id": i, "comune": "Altamura", "provincia": "BA", "materiale": "Calcare"} for i in range(200)]
+
+
+def make_app(minimum_size: int = 1024) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+    @app.get("/rows")
+    async def rows():
+        return JSONResponse(ROWS, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for i in range(3):
+                yield f"data: {i}\n\n" * 200
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+async def raw_get(app, path, accept_encoding):
+    """GET without httpx decoding the body, so the bytes on the wire can be checked"""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        async with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+            return response, b"".join([chunk async for chunk in response.aiter_raw()])
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [("gzip, deflate, br", "br"), ("gzip", "gzip"), ("br;q=0, gzip", "gzip"), ("*", "br"), ("identity", None), ("", None)],
+)
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding, decompress", [("br", brotli.decompress), ("gzip", gzip.decompress)])
+async def test_large_json_is_compressed(encoding, decompress):
+    response, body = await raw_get(make_app(), "/rows", encoding)
+    assert response.headers["Content-Encoding"] == encoding
+    assert int(response.headers["Content-Length"]) == len(body)
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == 'W/"abc"'
+    assert httpx.Response(200, content=decompress(body)).json() == ROWS
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path, accept_encoding, minimum_size",
+    [("/small", "br", 1024), ("/rows", "identity", 1024), ("/rows", "br", 0), ("/stream", "br", 1024)],
+)
+async def test_passthrough(path, accept_encoding, minimum_size):
+    response, _ = await raw_get(make_app(minimum_size), path, accept_encoding)
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+
+
+def test_lambda_results_with_a_content_encoding_become_base64():
+    # Mangum hands over compressed bytes that happen to decode as UTF-8 as text
+    body = "\x1f\x08\x00compressed"
+    result = ensure_base64_encoded_body(
+        {"statusCode": 200, "headers": {"Content-Encoding": "gzip"}, "body": body, "isBase64Encoded": False}
+    )
+    assert result["isBase64Encoded"] is True
+    assert base64.b64decode(result["body"]) == body.encode("utf-8")
+
+    plain = {"statusCode": 200, "headers": {"content-type": "application/json"}, "body": "{}", "isBase64Encoded": False}
+    assert ensure_base64_encoded_body(dict(plain)) == plain
@@ -0,0 +1,65 @@
+import pytest
+
+from routers.extraction_data import router
+from utils.cache import query_cache
+
+URL = "/api/v1/entities/extraction_data"
+ITEM = {"anno": 2020, "provincia": "BA", "materiale": "Calcare", "volume_m3": 1.0}
+
+
+@pytest.fixture(autouse=True)
+def listening(monkeypatch):
+    """Pin the ETag epoch: without a listener it rolls over with the cache TTL window"""
+    monkeypatch.setattr(query_cache, "listening", True)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_list_revalidates_with_304(api):
+    client = api(router)
+    first = await client.get(URL, params={"sort": "anno"})
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    etag = first.headers["ETag"]
+
+    again = await client.get(URL, params={"sort": "anno"}, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    # Weak validators (as rewritten by the compression middleware) match too
+    weak = await client.get(URL, params={"sort": "anno"}, headers={"If-None-Match": f"W/{etag}"})
+    assert weak.status_code == 304
+    # Another query string is another representation
+    other = await client.get(URL, params={"sort": "-anno"}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_the_etag(api):
+    client = api(router)
+    etag = (await client.get(URL)).headers["ETag"]
+
+    created = await client.post(URL, json=ITEM)
+    assert created.status_code == 201, created.text
+    after_create = await client.get(URL, headers={"If-None-Match": etag})
+    assert after_create.status_code == 200
+    assert after_create.json()["total"] == 1
+
+    etag = after_create.headers["ETag"]
+    await client.put(f"{URL}/{created.json()['id']}", json={"volume_m3": 2.0})
+    after_update = await client.get(URL, headers={"If-None-Match": etag})
+    assert after_update.status_code == 200
+    assert after_update.json()["items"][0]["volume_m3"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_etags_are_per_user(api):
+    etag = (await api(router, user_id="u1").get(URL)).headers["ETag"]
+    response = await api(router, user_id="u2").get(URL, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_other_users_writes_keep_the_etag(api):
+    mine, theirs = api(router, user_id="u1"), api(router, user_id="u2")
+    etag = (await mine.get(URL)).headers["ETag"]
+    await theirs.post(URL, json=ITEM)
+    assert (await mine.get(URL, headers={"If-None-Match": etag})).status_code == 304
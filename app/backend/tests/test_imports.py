@@ -0,0 +1,125 @@
+import io
+
+import pytest
+from openpyxl import Workbook
+from sqlalchemy import select
+
+from models.cave_details import Cave_details
+from routers.imports import router
+from services.config import ConfigService
+from services.imports import ImportService
+
+
+def register(*rows) -> io.BytesIO:
+    """An authorized-quarry register workbook with the given data rows"""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Numero Fascicolo", "Comune", "Provincia", "Stato Cava", "Materiale"])
+    for row in rows:
+        sheet.append(list(row))
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.asyncio
+async def test_import_without_valid_rows_keeps_the_year(db_session):
+    db_session.add(Cave_details(anno=2024, numero_fascicolo="1", comune="Bari", provincia="BA",
+                                stato_cava="AUTORIZZATA", materiale="Calcare", user_id="u1"))
+    await db_session.commit()
+
+    source = register(["2", "", "BA", "", "Calcare"], ["3", "Lecce", "", "", "Calcare"])
+    with pytest.raises(ValueError, match="No valid rows to import"):
+        await ImportService(db_session).import_cave_details(source, 2024, "u1")
+
+    kept = (await db_session.execute(select(Cave_details.comune).where(Cave_details.anno == 2024))).scalars().all()
+    assert kept == ["Bari"]
+
+
+@pytest.mark.asyncio
+async def test_import_replaces_the_year_and_reports_bad_rows(db_session, api):
+    db_session.add(Cave_details(anno=2024, comune="Vecchia", provincia="BA", user_id="u1"))
+    db_session.add(Cave_details(anno=2023, comune="Altro anno", provincia="BA", user_id="u1"))
+    await db_session.commit()
+
+    source = register(
+        ["1", "Altamura", "BA", None, "Calcare"],
+        [None] * 5,
+        ["2", "", "BA", "", ""],
+        ["3", "Trani", "BT", "CHIUSA", ""],
+    )
+    response = await api(router).post(
+        "/api/v1/import/cave_details", data={"anno": "2024"}, files={"file": ("cave.xlsx", source.getvalue())}
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["inserted"], body["deleted"]) == (2, 1)
+    assert body["errors"] == [{"row": 4, "error": "Missing value for Comune"}]
+
+    query = select(Cave_details.anno, Cave_details.comune, Cave_details.stato_cava)
+    rows = (await db_session.execute(query.order_by(Cave_details.anno, Cave_details.id))).all()
+    assert [tuple(row) for row in rows] == [
+        (2023, "Altro anno", None), (2024, "Altamura", "AUTORIZZATA"), (2024, "Trani", "CHIUSA")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_files_that_are_not_registers(api):
+    client = api(router)
+    response = await client.post(
+        "/api/v1/import/cave_details", data={"anno": "2024"}, files={"file": ("cave.xlsx", b"not a zip")}
+    )
+    assert response.status_code == 400
+    workbook = Workbook()
+    workbook.active.append(["Comune", "Anno"])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    response = await client.post(
+        "/api/v1/import/cave_details", data={"anno": "2024"}, files={"file": ("cave.xlsx", buffer.getvalue())}
+    )
+    assert response.json()["detail"] == "Missing column(s) in the header row: Provincia"
+
+
+@pytest.mark.asyncio
+async def test_import_checks_and_normalizes_against_the_configuration(db_session):
+    await ConfigService.create_province(db_session, "u1", "BA", "Bari")
+    await ConfigService.create_material(db_session, "u1", "Calcare")
+
+    source = register(
+        ["1", "Altamura", "bari", "", "calcare"],
+        ["2", "Lecce", "LE", "", "Calcare"],
+        ["3", "Gravina", "BA", "", "Tufo"],
+        ["4", "Bitonto", "ba", "", ""],
+    )
+    result = await ImportService(db_session).import_cave_details(source, 2024, "u1")
+    assert result["errors"] == [
+        {"row": 3, "error": "Unknown province 'LE'"},
+        {"row": 4, "error": "Unknown material 'Tufo'"},
+    ]
+    query = select(Cave_details.provincia, Cave_details.materiale).order_by(Cave_details.id)
+    assert [tuple(row) for row in (await db_session.execute(query)).all()] == [("BA", "Calcare"), ("BA", "")]
+
+
+@pytest.mark.asyncio
+async def test_config_lookups_are_cached_until_the_configuration_changes(db_session, monkeypatch):
+    await ConfigService.create_province(db_session, "u1", "BA", "Bari")
+    assert (await ConfigService.get_lookups(db_session, "u1")).province_name("BA") == "Bari"
+
+    statements = []
+    execute = db_session.execute
+
+    async def counting_execute(statement, *args, **kwargs):
+        statements.append(statement)
+        return await execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db_session, "execute", counting_execute)
+    await ConfigService.get_lookups(db_session, "u1")
+    assert statements == []
+
+    monkeypatch.undo()
+    await ConfigService.create_province(db_session, "u1", "LE", "Lecce")
+    lookups = await ConfigService.get_lookups(db_session, "u1")
+    assert lookups.province_code("lecce") == "LE"
+    # Other users have their own configuration
+    assert (await ConfigService.get_lookups(db_session, "u2")).provinces == {}
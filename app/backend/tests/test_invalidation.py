@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from services import invalidation
+from utils.cache import query_cache
+
+
+def test_notifications_bump_the_named_table_and_user():
+    before = query_cache.version("extraction_data", "u1"), query_cache.version("extraction_data", "u2")
+    invalidation._on_notification(None, 1, invalidation.CHANNEL, "extraction_data:u1")
+    assert query_cache.version("extraction_data", "u1") == before[0] + 1
+    assert query_cache.version("extraction_data", "u2") == before[1]
+
+    invalidation._on_notification(None, 1, invalidation.CHANNEL, "extraction_data:*")
+    assert query_cache.version("extraction_data", "u2") == before[1] + 1
+
+
+@pytest.mark.asyncio
+async def test_commit_changes_bumps_the_local_cache(db_session):
+    version = query_cache.version("extraction_data", "u1")
+    await invalidation.commit_changes(db_session, ["extraction_data"], "u1")
+    assert query_cache.version("extraction_data", "u1") == version + 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_commits_by_other_connections_invalidate_everything(tmp_path, monkeypatch):
+    monkeypatch.setattr(invalidation, "POLL_INTERVAL", 0.01)
+    url = f"sqlite+aiosqlite:///{tmp_path / 'shared.db'}"
+    listener_engine, writer_engine = create_async_engine(url), create_async_engine(url)
+    async with writer_engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE t (x INTEGER)"))
+
+    async with listener_engine.connect() as conn:
+        task = asyncio.create_task(invalidation._poll(conn))
+        try:
+            await asyncio.sleep(0.05)
+            assert query_cache.listening
+            version = query_cache.version("t", "u1")
+            async with writer_engine.begin() as writer:
+                await writer.execute(text("INSERT INTO t VALUES (1)"))
+            await asyncio.sleep(0.05)
+            assert query_cache.version("t", "u1") > version
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    assert not query_cache.listening
+    await listener_engine.dispose()
+    await writer_engine.dispose()
@@ -0,0 +1,135 @@
+import asyncio
+import base64
+import time
+from types import SimpleNamespace
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+import core.auth as core_auth
+from core.auth import JWKSCache, _cache_max_age, validate_id_token
+
+ISSUER = "https://issuer.example.com"
+JWKS_URL = f"{ISSUER}/.well-known/jwks.json"
+
+
+@pytest.fixture(autouse=True)
+def oidc_settings(monkeypatch):
+    monkeypatch.setenv("OIDC_ISSUER_URL", ISSUER)
+    monkeypatch.setenv("OIDC_CLIENT_ID", "client")
+    core_auth.jwks_cache.clear()
+    yield
+    core_auth.jwks_cache.clear()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    # Not time.monotonic itself, which the event loop runs on
+    monkeypatch.setattr(core_auth, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.fixture
+def issuer(monkeypatch):
+    """Fake JWKS endpoint; `issuer.keys` is what it currently publishes"""
+
+    class Issuer:
+        keys = [{"kid": "k1"}]
+        max_age = 100.0
+        calls = 0
+
+    async def fetch(url):
+        assert url == JWKS_URL
+        Issuer.calls += 1
+        await asyncio.sleep(0)
+        return {"keys": list(Issuer.keys)}, Issuer.max_age
+
+    monkeypatch.setattr(core_auth, "_fetch_jwks", fetch)
+    return Issuer
+
+
+@pytest.mark.parametrize(
+    "header, max_age",
+    [(None, 300.0), ("public, max-age=600", 600.0), ("max-age=99999999", 86400.0), ("no-store", 0.0), ("max-age=x", 300.0)],
+)
+def test_cache_max_age(header, max_age):
+    assert _cache_max_age(header) == max_age
+
+
+@pytest.mark.asyncio
+async def test_jwks_is_fetched_once_for_concurrent_callers(clock, issuer):
+    cache = JWKSCache()
+    results = await asyncio.gather(*[cache.get(JWKS_URL) for _ in range(10)])
+    assert issuer.calls == 1
+    assert all(result == {"keys": [{"kid": "k1"}]} for result in results)
+    await cache.get(JWKS_URL)
+    assert issuer.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_jwks_refreshes_in_the_background_before_expiry(clock, issuer):
+    cache = JWKSCache()
+    await cache.get(JWKS_URL)
+    issuer.keys = [{"kid": "k2"}]
+
+    clock.now += 85  # past the refresh-ahead point, before max-age
+    assert await cache.get(JWKS_URL) == {"keys": [{"kid": "k1"}]}
+    await asyncio.sleep(0.01)
+    assert issuer.calls == 2
+    assert await cache.get(JWKS_URL) == {"keys": [{"kid": "k2"}]}
+
+    clock.now += 200  # expired: the caller waits for fresh keys
+    issuer.keys = [{"kid": "k3"}]
+    assert await cache.get(JWKS_URL) == {"keys": [{"kid": "k3"}]}
+
+
+@pytest.mark.asyncio
+async def test_forced_refreshes_are_throttled(clock, issuer):
+    cache = JWKSCache()
+    await cache.get(JWKS_URL)
+    await cache.get(JWKS_URL, force_refresh=True)
+    assert issuer.calls == 1
+    clock.now += core_auth.JWKS_MIN_FORCED_REFRESH_INTERVAL
+    await cache.get(JWKS_URL, force_refresh=True)
+    assert issuer.calls == 2
+
+
+def _rsa_jwk(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    numbers = private_key.public_key().public_numbers()
+
+    def b64(value):
+        return base64.urlsafe_b64encode(value.to_bytes((value.bit_length() + 7) // 8, "big")).rstrip(b"=").decode()
+
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    return pem, {"kid": kid, "kty": "RSA", "n": b64(numbers.n), "e": b64(numbers.e)}
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refetches_rotated_keys(clock, issuer):
+    old_pem, old_jwk = _rsa_jwk("old")
+    new_pem, new_jwk = _rsa_jwk("new")
+    issuer.keys = [old_jwk]
+    claims = {"sub": "u1", "iss": ISSUER, "aud": "client", "exp": int(time.time()) + 60}
+
+    token = jwt.encode(claims, old_pem.decode(), algorithm="RS256", headers={"kid": "old"})
+    assert (await validate_id_token(token))["sub"] == "u1"
+
+    issuer.keys = [old_jwk, new_jwk]
+    clock.now += core_auth.JWKS_MIN_FORCED_REFRESH_INTERVAL
+    token = jwt.encode(claims, new_pem.decode(), algorithm="RS256", headers={"kid": "new"})
+    assert (await validate_id_token(token))["sub"] == "u1"
+    assert issuer.calls == 2
@@ -0,0 +1,62 @@
+import pytest
+
+from routers.extraction_data import router
+from services.extraction_data import Extraction_dataService
+
+URL = "/api/v1/entities/extraction_data"
+
+
+async def seed(db, count=5):
+    await Extraction_dataService(db).create_many(
+        [{"anno": 2015 + i, "provincia": "BA", "materiale": "Calcare", "volume_m3": float(i)} for i in range(count)],
+        user_id="u1",
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count, total", [("exact", 5), ("estimate", 5), ("none", None)])
+async def test_count_modes(db_session, api, count, total):
+    await seed(db_session)
+    response = await api(router).get(URL, params={"limit": 2, "count": count})
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["items"]) == 2
+    assert body["total"] == total
+
+
+@pytest.mark.asyncio
+async def test_exact_total_past_the_last_page_and_with_a_cursor(db_session, api):
+    await seed(db_session)
+    client = api(router)
+    assert (await client.get(URL, params={"skip": 10})).json() == {
+        "items": [], "total": 5, "skip": 10, "limit": 20, "next_cursor": None
+    }
+    cursor = (await client.get(URL, params={"limit": 2})).json()["next_cursor"]
+    assert (await client.get(URL, params={"limit": 2, "cursor": cursor})).json()["total"] == 5
+
+
+@pytest.mark.asyncio
+async def test_unknown_count_mode_is_rejected(api):
+    assert (await api(router).get(URL, params={"count": "some"})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_fields_select_only_those_columns(db_session, api):
+    await seed(db_session)
+    response = await api(router).get(URL, params={"fields": "anno, volume_m3", "sort": "-volume_m3", "limit": 2})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    # id and the sort field always come along, for cursors
+    assert [sorted(item) for item in items] == [["anno", "id", "volume_m3"]] * 2
+    assert [item["anno"] for item in items] == [2019, 2018]
+
+    cursor = response.json()["next_cursor"]
+    rest = await api(router).get(URL, params={"fields": "anno", "sort": "-volume_m3", "cursor": cursor})
+    assert [item["anno"] for item in rest.json()["items"]] == [2017, 2016, 2015]
+
+
+@pytest.mark.asyncio
+async def test_unknown_fields_are_rejected(api):
+    response = await api(router).get(URL, params={"fields": "anno,tonnellate"})
+    assert response.status_code == 400
+    assert "tonnellate" in response.json()["detail"]
@@ -0,0 +1,63 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+from asyncpg.exceptions import UniqueViolationError
+from sqlalchemy import func, select
+
+from models.extraction_data import Extraction_data
+from routers.loader import router
+from services.loader import LoaderService
+
+HEADER = "anno,provincia,materiale,volume_m3\n"
+
+
+async def count_rows(db) -> int:
+    return (await db.execute(select(func.count()).select_from(Extraction_data))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_load_reports_ragged_csv_lines(db_session):
+    stream = io.StringIO(HEADER + "2033,BA,X,1.5,9\n2033,BA,Y,2\n")
+    result = await LoaderService(db_session).load("extraction_data", stream, "csv", "u1")
+    assert result["loaded"] == 1
+    assert result["errors"] == [{"line": 2, "error": "Too many fields: 1 more than the header"}]
+
+
+@pytest.mark.asyncio
+async def test_unknown_csv_header_column_fails_the_load_once(db_session, api):
+    csv_file = "anno,provincia,materiale,volume_m3,tonnellate,note\n2033,BA,X,1.5,2,a\n2034,BA,X,1.5,3,b\n"
+    response = await api(router).post("/api/v1/load/extraction_data", files={"file": ("data.csv", csv_file)})
+    assert response.status_code == 400
+    assert response.json()["detail"] == (
+        "Unknown column(s) in the CSV header for Extraction_data: tonnellate, note"
+    )
+    assert await count_rows(db_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_load_duplicate_natural_key_is_a_validation_error(db_session):
+    stream = io.StringIO(HEADER + "2033,BA,X,1.5\n2033,BA,X,2\n")
+    with pytest.raises(ValueError, match="Duplicate natural key"):
+        await LoaderService(db_session).load("extraction_data", stream, "csv", "u1")
+    assert await count_rows(db_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_load_maps_asyncpg_constraint_violations(db_session, monkeypatch):
+    # PostgreSQL loads with COPY on the raw asyncpg connection, whose errors are not
+    # wrapped in SQLAlchemy's IntegrityError
+    async def copy_records_to_table(*args, **kwargs):
+        raise UniqueViolationError("duplicate key value violates unique constraint")
+
+    async def get_raw_connection():
+        return SimpleNamespace(driver_connection=SimpleNamespace(copy_records_to_table=copy_records_to_table))
+
+    async def connection():
+        return SimpleNamespace(get_raw_connection=get_raw_connection)
+
+    monkeypatch.setattr(db_session.bind.dialect, "name", "postgresql")
+    monkeypatch.setattr(db_session, "connection", connection)
+    stream = io.StringIO(HEADER + "2033,BA,X,1.5\n")
+    with pytest.raises(ValueError, match="Duplicate natural key"):
+        await LoaderService(db_session).load("extraction_data", stream, "csv", "u1")
@@ -0,0 +1,56 @@
+import pytest
+
+from models.cave_details import Cave_details
+from services.cave_details import Cave_detailsService
+
+COMUNI = ["Bari", None, "Andria", None, "Bari", "Lecce"]
+
+
+async def seed(db):
+    db.add_all(
+        Cave_details(anno=2024, comune=comune, provincia="BA", materiale=f"M{i}", user_id="u1")
+        for i, comune in enumerate(COMUNI)
+    )
+    await db.commit()
+
+
+async def walk(service, sort, limit=2):
+    """Ids of every row, following next_cursor page by page"""
+    ids, cursor = [], None
+    while True:
+        page = await service.get_list(limit=limit, user_id="u1", sort=sort, cursor=cursor, count="none")
+        ids += [item.id for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort", ["comune", "-comune", "anno", "-id"])
+async def test_cursor_pages_match_offset_pages(db_session, sort):
+    await seed(db_session)
+    service = Cave_detailsService(db_session)
+
+    offset = await service.get_list(limit=100, user_id="u1", sort=sort)
+    expected = [item.id for item in offset["items"]]
+    assert len(expected) == len(COMUNI)
+    for limit in (1, 2, 4):
+        assert await walk(service, sort, limit) == expected
+
+
+@pytest.mark.asyncio
+async def test_nulls_sort_last_in_both_directions(db_session):
+    await seed(db_session)
+    service = Cave_detailsService(db_session)
+    for sort in ("comune", "-comune"):
+        items = (await service.get_list(limit=100, user_id="u1", sort=sort))["items"]
+        assert [item.comune for item in items][-2:] == [None, None]
+
+
+@pytest.mark.asyncio
+async def test_cursor_for_another_sort_is_rejected(db_session):
+    await seed(db_session)
+    service = Cave_detailsService(db_session)
+    cursor = (await service.get_list(limit=2, user_id="u1", sort="comune"))["next_cursor"]
+    with pytest.raises(ValueError, match="Cursor was issued for sort"):
+        await service.get_list(limit=2, user_id="u1", sort="anno", cursor=cursor)
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from models.extraction_data import Extraction_data
+from routers.extraction_data import router
+from utils.query import build_filters
+
+
+def test_operands_are_converted_to_the_column_type():
+    (condition,) = build_filters(Extraction_data, {"anno": {"$gte": "2020"}})
+    assert condition.right.value == 2020
+    (condition,) = build_filters(Extraction_data, {"anno": {"$in": ["2020", 2021.0]}})
+    assert condition.right.value == [2020, 2021]
+
+
+@pytest.mark.parametrize(
+    "query, message",
+    [
+        ({"anno": {"$gte": "abc"}}, "Invalid value 'abc' for 'anno'"),
+        ({"anno": {"$in": [2020, "x"]}}, "Invalid value 'x' for 'anno'"),
+        ({"anno": "abc"}, "Invalid value 'abc' for 'anno'"),
+        ({"volume_m3": {"$lt": True}}, "Invalid value True for 'volume_m3'"),
+        ({"anno": {"$in": 2020}}, "expects a list"),
+        ({"anno": {"$regex": "^2"}}, "Unknown operator"),
+        ({"nope": 1}, "Unknown field"),
+    ],
+)
+def test_invalid_filters_are_rejected(query, message):
+    with pytest.raises(ValueError, match=message):
+        build_filters(Extraction_data, query)
+
+
+@pytest.mark.asyncio
+async def test_operator_filters_select_rows(db_session, api):
+    db_session.add_all(
+        Extraction_data(anno=anno, provincia=provincia, materiale="Calcare", volume_m3=anno - 2000, user_id="u1")
+        for anno, provincia in [(2019, "BA"), (2020, "LE"), (2021, "BA"), (2022, "TA")]
+    )
+    await db_session.commit()
+    client = api(router)
+
+    async def annos(query):
+        response = await client.get("/api/v1/entities/extraction_data", params={"query": json.dumps(query), "sort": "anno"})
+        assert response.status_code == 200, response.text
+        return [item["anno"] for item in response.json()["items"]]
+
+    assert await annos({"anno": {"$gte": "2020", "$lt": 2022}}) == [2020, 2021]
+    assert await annos({"provincia": {"$nin": ["BA"]}}) == [2020, 2022]
+    assert await annos({"provincia": "BA", "volume_m3": {"$gt": 19.5}}) == [2021]
+
+
+@pytest.mark.asyncio
+async def test_mistyped_operand_is_a_bad_request(api):
+    response = await api(router).get("/api/v1/entities/extraction_data", params={"query": '{"anno": {"$gte": "abc"}}'})
+    assert response.status_code == 400
+    assert "Invalid value 'abc'" in response.json()["detail"]
@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from models.extraction_data import Extraction_data
+from models.rollups import Extraction_data_rollup
+from services.extraction_data import Extraction_dataService
+from services.rollups import refresh_rollup_groups, refresh_rollup_scope
+
+GROUP = ("u1", 2020, "BA", "Calcare")
+
+
+async def rollup_rows(db):
+    result = await db.execute(
+        select(Extraction_data_rollup.anno, Extraction_data_rollup.materiale,
+               Extraction_data_rollup.row_count, Extraction_data_rollup.volume_m3)
+        .order_by(Extraction_data_rollup.anno, Extraction_data_rollup.materiale)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+@pytest.mark.asyncio
+async def test_writes_keep_the_rollup_in_step(db_session):
+    service = Extraction_dataService(db_session)
+    first = await service.create({"anno": 2020, "provincia": "BA", "materiale": "Calcare", "volume_m3": 3.0}, user_id="u1")
+    await service.create({"anno": 2021, "provincia": "BA", "materiale": "Calcare", "volume_m3": 1.0}, user_id="u1")
+    assert await rollup_rows(db_session) == [(2020, "Calcare", 1, 3.0), (2021, "Calcare", 1, 1.0)]
+
+    await service.update(first.id, {"volume_m3": 5.0}, user_id="u1")
+    assert await rollup_rows(db_session) == [(2020, "Calcare", 1, 5.0), (2021, "Calcare", 1, 1.0)]
+
+    # Moving the only row of a group to another one drops the emptied group
+    await service.update(first.id, {"materiale": "Argilla"}, user_id="u1")
+    assert await rollup_rows(db_session) == [(2020, "Argilla", 1, 5.0), (2021, "Calcare", 1, 1.0)]
+
+    await service.delete(first.id, user_id="u1")
+    assert await rollup_rows(db_session) == [(2021, "Calcare", 1, 1.0)]
+
+
+@pytest.mark.asyncio
+async def test_refresh_overwrites_an_existing_group(db_session):
+    # What a concurrent transaction refreshing the same group leaves behind
+    db_session.add(Extraction_data(anno=2020, provincia="BA", materiale="Calcare", volume_m3=4.0, user_id="u1"))
+    await db_session.execute(insert(Extraction_data_rollup).values(
+        user_id="u1", anno=2020, provincia="BA", materiale="Calcare", row_count=9, volume_m3=99.0
+    ))
+    await db_session.flush()
+    await refresh_rollup_groups(db_session, Extraction_data, {GROUP})
+    assert await rollup_rows(db_session) == [(2020, "Calcare", 1, 4.0)]
+
+
+@pytest.mark.asyncio
+async def test_scope_refresh_removes_groups_without_rows(db_session):
+    await db_session.execute(insert(Extraction_data_rollup).values(
+        user_id="u1", anno=2020, provincia="BA", materiale="Calcare", row_count=1, volume_m3=1.0
+    ))
+    await refresh_rollup_scope(db_session, Extraction_data, user_id="u1", anno=2020)
+    assert await rollup_rows(db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_rollup_failures_are_not_reported_as_duplicate_keys(db_session, monkeypatch):
+    execute = db_session.execute
+
+    async def failing_rollup_write(statement, *args, **kwargs):
+        if getattr(statement, "table", None) is Extraction_data_rollup.__table__:
+            raise IntegrityError(str(statement), {}, Exception("rollup primary key"))
+        return await execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db_session, "execute", failing_rollup_write)
+    with pytest.raises(RuntimeError, match="Refreshing extraction_data_rollup failed"):
+        await Extraction_dataService(db_session).create(
+            {"anno": 2020, "provincia": "BA", "materiale": "Calcare", "volume_m3": 1.0}, user_id="u1"
+        )
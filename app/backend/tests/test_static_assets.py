@@ -0,0 +1,58 @@
+import base64
+import gzip
+
+import brotli
+import pytest
+
+import lambda_handler
+
+SCRIPT = b"console.log('quarry');\n" * 200
+
+
+@pytest.fixture
+def dist(tmp_path, monkeypatch):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "index-AbCdEf12.js").write_bytes(SCRIPT)
+    (tmp_path / "index.html").write_text("<!doctype html><title>App</title>")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(range(256)))
+    monkeypatch.setattr(lambda_handler, "static_assets", lambda_handler.load_static_assets(str(tmp_path)))
+    return tmp_path
+
+
+def test_assets_are_served_in_the_best_accepted_coding(dist):
+    br = lambda_handler.serve_static_file("/assets/index-AbCdEf12.js", {"Accept-Encoding": "gzip, br"})
+    assert br["headers"]["Content-Encoding"] == "br"
+    assert br["isBase64Encoded"] is True
+    assert brotli.decompress(base64.b64decode(br["body"])) == SCRIPT
+    assert br["headers"]["Cache-Control"] == lambda_handler.IMMUTABLE_CACHE_CONTROL
+    assert br["headers"]["Vary"] == "Accept-Encoding"
+
+    gz = lambda_handler.serve_static_file("/assets/index-AbCdEf12.js", {"accept-encoding": "gzip"})
+    assert gzip.decompress(base64.b64decode(gz["body"])) == SCRIPT
+
+    plain = lambda_handler.serve_static_file("/assets/index-AbCdEf12.js", {"Accept-Encoding": "br;q=0"})
+    assert "Content-Encoding" not in plain["headers"]
+    assert base64.b64decode(plain["body"]) == SCRIPT
+    assert len({br["headers"]["ETag"], gz["headers"]["ETag"], plain["headers"]["ETag"]}) == 3
+
+
+def test_small_and_binary_files(dist):
+    page = lambda_handler.serve_frontend({"Accept-Encoding": "br"})
+    assert page["body"] == "<!doctype html><title>App</title>"
+    assert page["headers"]["Cache-Control"] == lambda_handler.REVALIDATE_CACHE_CONTROL
+    assert "Content-Encoding" not in page["headers"]
+
+    logo = lambda_handler.serve_static_file("/logo.png")
+    assert logo["isBase64Encoded"] is True
+    assert base64.b64decode(logo["body"]).startswith(b"\x89PNG")
+
+    assert lambda_handler.serve_static_file("/missing.js")["statusCode"] == 404
+
+
+def test_any_representation_etag_revalidates(dist):
+    gz = lambda_handler.serve_static_file("/assets/index-AbCdEf12.js", {"Accept-Encoding": "gzip"})
+    response = lambda_handler.serve_static_file(
+        "/assets/index-AbCdEf12.js", {"Accept-Encoding": "br", "If-None-Match": f'W/{gz["headers"]["ETag"]}'}
+    )
+    assert response["statusCode"] == 304
+    assert response["body"] == ""
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+import dependencies.auth as deps_auth
+from core.auth import create_access_token
+
+
+@pytest.fixture(autouse=True)
+def token_settings(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET_KEY", "test-secret")
+    monkeypatch.setenv("JWT_ALGORITHM", "HS256")
+    monkeypatch.setenv("JWT_EXPIRE_MINUTES", "60")
+    deps_auth.clear_token_cache()
+    yield
+    deps_auth.clear_token_cache()
+
+
+@pytest.mark.asyncio
+async def test_verified_tokens_are_cached_until_exp(monkeypatch):
+    decoded = []
+    decode = deps_auth.decode_access_token
+    monkeypatch.setattr(deps_auth, "decode_access_token", lambda token: decoded.append(token) or decode(token))
+    token = create_access_token({"sub": "u1", "email": "u1@example.com"}, expires_minutes=1)
+
+    first = await deps_auth.get_current_user(token)
+    second = await deps_auth.get_current_user(token)
+    assert first == second and first.id == "u1"
+    assert len(decoded) == 1
+
+    # Past its exp the cached entry is dropped and the token verified again
+    exp = jwt.get_unverified_claims(token)["exp"]
+    monkeypatch.setattr(deps_auth, "time", SimpleNamespace(time=lambda: exp + 1))
+    await deps_auth.get_current_user(token)
+    assert len(decoded) == 2
+
+
+@pytest.mark.asyncio
+async def test_invalid_tokens_are_not_cached():
+    for _ in range(2):
+        with pytest.raises(HTTPException) as error:
+            await deps_auth.get_current_user("not-a-token")
+        assert error.value.status_code == 401
+    assert len(deps_auth._token_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_token_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(deps_auth, "TOKEN_CACHE_SIZE", 2)
+    tokens = [create_access_token({"sub": f"u{i}"}) for i in range(3)]
+    for token in tokens:
+        await deps_auth.get_current_user(token)
+    assert len(deps_auth._token_cache) == 2
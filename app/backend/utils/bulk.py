@@ -0,0 +1,182 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import Integer, any_, bindparam, column, delete, func, insert, select, update, values
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Rows per execute() call. SQLAlchemy further splits each call into multi-row
+# INSERT ... VALUES statements (insertmanyvalues), so this only bounds memory per round.
+BULK_CHUNK_SIZE = 1000
+
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def natural_key(model) -> Optional[List[str]]:
+    """Columns of the model's unique (user_id, ...) index, or None when it has no natural key"""
+    for index in model.__table__.indexes:
+        if index.unique and "user_id" in index.columns:
+            return [c.name for c in index.columns]
+    return None
+
+
+def _chunks(items: List[Any], size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def bulk_insert(
+    db: AsyncSession, model, rows: List[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE
+) -> List[Any]:
+    """Insert `rows` with multi-row INSERT ... RETURNING and return the new ORM instances
+
+    Instances come back in the order of `rows`. Nothing is committed: the caller owns the
+    transaction, so a failing chunk rolls back the whole batch.
+    """
+    created = []
+    for chunk in _chunks(rows, chunk_size):
+        statement = insert(model).returning(model, sort_by_parameter_order=True)
+        result = await db.execute(statement, chunk)
+        created.extend(result.scalars().all())
+    return created
+
+
+async def bulk_upsert(
+    db: AsyncSession, model, rows: List[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE
+) -> List[Dict[str, Any]]:
+    """INSERT ... ON CONFLICT (natural key) DO UPDATE ... RETURNING for `rows`
+
+    Rows whose natural key already exists are updated in place (created_at is kept), the
+    rest are inserted; repeated keys within `rows` collapse to the last one. Returns the
+    resulting rows in first-seen key order. Nothing is committed.
+    """
+    key = natural_key(model)
+    if key is None:
+        raise ValueError(f"{model.__name__} has no natural key to upsert on")
+    dialect = db.bind.dialect.name
+    if dialect not in UPSERT_INSERTS:
+        raise ValueError(f"Upsert is not supported on {dialect}")
+
+    table = model.__table__
+    by_key = {}
+    for row in rows:
+        missing = [k for k in key if row.get(k) is None]
+        if missing:
+            raise ValueError(f"Missing natural key field(s): {', '.join(missing)}")
+        by_key[tuple(row[k] for k in key)] = row
+    columns = [c.name for c in table.columns if any(c.name in row for row in by_key.values()) and c.name != "id"]
+    updated = [c for c in columns if c not in key and c != "created_at"]
+
+    upserted = []
+    for chunk in _chunks(list(by_key.values()), chunk_size):
+        statement = UPSERT_INSERTS[dialect](table).values([{c: row.get(c) for c in columns} for row in chunk])
+        if updated:
+            statement = statement.on_conflict_do_update(
+                index_elements=key, set_={c: statement.excluded[c] for c in updated}
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=key)
+        result = await db.execute(statement.returning(*table.c))
+        upserted.extend(dict(row) for row in result.mappings())
+    # RETURNING does not promise input order
+    position = {k: i for i, k in enumerate(by_key)}
+    upserted.sort(key=lambda row: position.get(tuple(row[k] for k in key), len(position)))
+    return upserted
+
+
+async def bulk_update(
+    db: AsyncSession,
+    model,
+    updates: Dict[int, Dict[str, Any]],
+    user_id: Optional[str] = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> List[Dict[str, Any]]:
+    """Apply per-id partial updates set-based and return the updated rows in request order
+
+    PostgreSQL - one UPDATE ... FROM (VALUES ...) ... RETURNING per chunk. A NULL in the
+                 VALUES list keeps the current value, matching partial updates that drop None.
+    others     - one executemany per distinct set of updated columns, then one SELECT.
+
+    With `user_id` the ownership check is part of the WHERE clause, so ids owned by someone
+    else are skipped. `id` and `user_id` are never updated. Nothing is committed.
+    """
+    table = model.__table__
+    updates = {
+        obj_id: {k: v for k, v in data.items() if k in table.c and k not in ("id", "user_id")}
+        for obj_id, data in updates.items()
+    }
+    columns = [c.name for c in table.columns if any(c.name in data for data in updates.values())]
+    owned = [table.c.user_id == user_id] if user_id else []
+    rows = {}
+
+    if columns and db.bind.dialect.name == "postgresql":
+        for chunk in _chunks(list(updates.items()), chunk_size):
+            batch = values(
+                column("id", table.c.id.type), *[column(c, table.c[c].type) for c in columns], name="batch"
+            ).data([(obj_id, *[data.get(c) for c in columns]) for obj_id, data in chunk])
+            statement = (
+                update(table)
+                .where(table.c.id == batch.c.id, *owned)
+                .values({c: func.coalesce(batch.c[c], table.c[c]) for c in columns})
+                .returning(*table.c)
+            )
+            result = await db.execute(statement)
+            rows.update((row["id"], dict(row)) for row in result.mappings())
+    else:
+        grouped = defaultdict(list)
+        for obj_id, data in updates.items():
+            if data:
+                grouped[tuple(sorted(data))].append({"_id": obj_id, **{f"_{k}": v for k, v in data.items()}})
+        for keys, params in grouped.items():
+            statement = (
+                update(table)
+                .where(table.c.id == bindparam("_id"), *owned)
+                .values({k: bindparam(f"_{k}") for k in keys})
+            )
+            for chunk in _chunks(params, chunk_size):
+                await db.execute(statement, chunk)
+        for chunk in _chunks(list(updates), chunk_size):
+            result = await db.execute(select(table).where(table.c.id.in_(chunk), *owned))
+            rows.update((row["id"], dict(row)) for row in result.mappings())
+
+    return [rows[obj_id] for obj_id in updates if obj_id in rows]
+
+
+async def delete_where(
+    db: AsyncSession, model, conditions: List[Any], returning: Iterable[str] = ()
+) -> List[Dict[str, Any]]:
+    """DELETE ... WHERE <conditions> RETURNING id (plus `returning` columns) in one statement"""
+    table = model.__table__
+    statement = delete(table).where(*conditions).returning(table.c.id, *[table.c[c] for c in returning])
+    result = await db.execute(statement)
+    return [dict(row) for row in result.mappings()]
+
+
+async def bulk_delete(
+    db: AsyncSession,
+    model,
+    ids: List[int],
+    user_id: Optional[str] = None,
+    returning: Iterable[str] = (),
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> List[Dict[str, Any]]:
+    """Delete rows by id and return the deleted ids (plus `returning` columns)
+
+    PostgreSQL binds the ids as a single array (id = ANY(:ids)), so the whole batch is one
+    statement with one parameter; elsewhere ids go in IN lists of `chunk_size`. With
+    `user_id` only that user's rows are deleted. Nothing is committed.
+    """
+    if not ids:
+        return []
+    table = model.__table__
+    owned = [table.c.user_id == user_id] if user_id else []
+    if db.bind.dialect.name == "postgresql":
+        matched = table.c.id == any_(bindparam("ids", list(ids), type_=ARRAY(Integer)))
+        return await delete_where(db, model, [matched, *owned], returning)
+    deleted = []
+    for chunk in _chunks(list(ids), chunk_size):
+        deleted.extend(await delete_where(db, model, [table.c.id.in_(chunk), *owned], returning))
+    return deleted
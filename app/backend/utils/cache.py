@@ -0,0 +1,111 @@
+import json
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Optional, Tuple
+
+from core.config import settings
+
+
+def cache_key(table: str, user_id: Optional[str], *parts: Any) -> Tuple:
+    """Hashable cache key for a query on `table` by `user_id`; dict/list parts are serialized canonically"""
+    return (table, user_id) + tuple(
+        json.dumps(part, sort_keys=True, default=str) if isinstance(part, (dict, list)) else part
+        for part in parts
+    )
+
+
+class QueryCache:
+    """In-process LRU of query results with a TTL, invalidated by version counters
+
+    Keys are (table, user_id, ...). Writers call bump(table, user_id) after committing: that
+    invalidates the user's entries and the table's user-less (/all) entries; a bump without
+    a user invalidates the whole table. Readers take version(table, user_id) *before* running
+    the query and pass it to put(), so a result computed while a write was committing is
+    never stored under the newer version. Other processes learn about writes through
+    services.invalidation, which sets `listening` while it is connected.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[int, float, Any]]" = OrderedDict()
+        self._epoch = 0  # bumped by bump_all()
+        self._any: Dict[str, int] = defaultdict(int)  # every change to the table
+        self._wide: Dict[str, int] = defaultdict(int)  # changes not scoped to one user
+        self._user: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.listening = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def version(self, table: str, user_id: Optional[str] = None) -> int:
+        """Counter that grows whenever results of `table` as seen by `user_id` may change
+
+        None stands for reads across all users, which every write affects.
+        """
+        if user_id is None:
+            return self._epoch + self._any[table]
+        return self._epoch + self._wide[table] + self._user[(table, user_id)]
+
+    def bump(self, *tables: str, user_id: Optional[str] = None) -> None:
+        """Invalidate cached results of `tables` for `user_id` (all users when None)"""
+        for table in tables:
+            self._any[table] += 1
+            if user_id is None:
+                self._wide[table] += 1
+            else:
+                self._user[(table, user_id)] += 1
+        stale = [
+            key for key in self._entries
+            if key[0] in tables and (user_id is None or key[1] is None or key[1] == user_id)
+        ]
+        for key in stale:
+            del self._entries[key]
+
+    def bump_all(self) -> None:
+        """Invalidate everything, e.g. after notifications may have been missed"""
+        self._epoch += 1
+        self._entries.clear()
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """Cached value for `key`, or None when missing, expired or outdated"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            version, expires_at, value = entry
+            if version == self.version(key[0], key[1]) and expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: Tuple, version: int, value: Any) -> None:
+        """Store `value` computed at table `version`; dropped if the table changed since"""
+        if self.max_entries <= 0 or version != self.version(key[0], key[1]):
+            return
+        self._entries[key] = (version, time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "listening": self.listening,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Entity list / `/all` results, see the *Service.get_list methods
+query_cache = QueryCache(max_entries=settings.query_cache_size, ttl=settings.query_cache_ttl)
@@ -0,0 +1,145 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import Date, DateTime, and_, func, literal_column, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+COUNT_MODES = ("exact", "estimate", "none")
+
+
+def resolve_sort(model, sort: Optional[str]) -> Tuple[str, bool]:
+    """Return (field_name, descending) for a sort expression, defaulting to newest first"""
+    if sort:
+        descending = sort.startswith('-')
+        field_name = sort[1:] if descending else sort
+        if field_name in model.__table__.columns:
+            return field_name, descending
+    return "id", True
+
+
+def apply_sort(query, model, sort: Optional[str]):
+    """Order by the sort field with `id` as tie-breaker so pages are stable
+
+    NULLs of a nullable sort field always come last, in either direction, which is the
+    position apply_cursor seeks against.
+    """
+    field_name, descending = resolve_sort(model, sort)
+    column = getattr(model, field_name)
+    if field_name == "id":
+        return query.order_by(column.desc() if descending else column.asc())
+    order = column.desc() if descending else column.asc()
+    if column.nullable:
+        order = order.nulls_last()
+    return query.order_by(order, model.id.desc() if descending else model.id.asc())
+
+
+def encode_cursor(model, sort: Optional[str], obj: Any) -> str:
+    """Build an opaque cursor pointing just after `obj` in the given sort order"""
+    field_name, descending = resolve_sort(model, sort)
+    value = obj[field_name] if isinstance(obj, dict) else getattr(obj, field_name)
+    obj_id = obj["id"] if isinstance(obj, dict) else obj.id
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    payload = {"s": f"-{field_name}" if descending else field_name, "v": value, "id": obj_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, dict) or not {"s", "v", "id"} <= payload.keys():
+            raise ValueError("missing keys")
+        return payload
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def apply_cursor(query, model, sort: Optional[str], cursor: str):
+    """Seek past the cursor position on (sort field, id) instead of using OFFSET"""
+    field_name, descending = resolve_sort(model, sort)
+    payload = decode_cursor(cursor)
+    expected = f"-{field_name}" if descending else field_name
+    if payload["s"] != expected:
+        raise ValueError(f"Cursor was issued for sort '{payload['s']}', not '{expected}'")
+
+    value = payload["v"]
+    column = getattr(model, field_name)
+    if value is not None and isinstance(column.type, DateTime):
+        value = datetime.fromisoformat(value)
+    elif value is not None and isinstance(column.type, Date):
+        value = date.fromisoformat(value)
+
+    if field_name == "id":
+        return query.where(model.id < value if descending else model.id > value)
+    after_id = model.id < payload["id"] if descending else model.id > payload["id"]
+    if not column.nullable:
+        key = tuple_(column, model.id)
+        position = tuple_(value, payload["id"])
+        return query.where(key < position if descending else key > position)
+    # Row comparisons are never true on NULL; the NULLs sit after every value (see apply_sort)
+    if value is None:
+        return query.where(column.is_(None), after_id)
+    beyond = column < value if descending else column > value
+    return query.where(or_(beyond, and_(column == value, after_id), column.is_(None)))
+
+
+async def estimate_count(db: AsyncSession, count_query) -> int:
+    """Row estimate from the PostgreSQL planner statistics for the filters of `count_query`"""
+    conn = await db.connection()
+    compiled = count_query.with_only_columns(literal_column("1"), maintain_column_froms=True).compile(dialect=conn.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup or ())
+    result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + compiled.string, params)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query,
+    count_query,
+    limit: int,
+    count: str = "exact",
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    projected: bool = False,
+) -> Tuple[List[Any], Optional[int]]:
+    """Run the page query and resolve the total according to `count`
+
+    exact    - count(*) OVER() on the page query itself, so one round trip. With a cursor
+               the window would only see rows after it, so count_query runs instead.
+    estimate - planner row estimate on PostgreSQL, exact count_query elsewhere.
+    none     - no counting at all, total is None.
+
+    Projected (column-only) queries return plain dicts instead of ORM instances.
+    """
+    if count not in COUNT_MODES:
+        raise ValueError(f"Invalid count mode '{count}', expected one of {', '.join(COUNT_MODES)}")
+
+    if count == "exact" and not cursor:
+        result = await db.execute(query.add_columns(func.count().over().label("_total")).limit(limit))
+        rows = result.all()
+        if rows:
+            if projected:
+                items = [{k: v for k, v in row._mapping.items() if k != "_total"} for row in rows]
+            else:
+                items = [row[0] for row in rows]
+            return items, rows[0]._total
+        if not skip:
+            return [], 0
+        # Page past the end: the window has no row to report the total on
+        return [], (await db.execute(count_query)).scalar()
+
+    result = await db.execute(query.limit(limit))
+    items = [dict(row) for row in result.mappings()] if projected else result.scalars().all()
+    if count == "none":
+        return items, None
+    if count == "estimate" and db.bind.dialect.name == "postgresql":
+        return items, await estimate_count(db, count_query)
+    return items, (await db.execute(count_query)).scalar()
@@ -0,0 +1,81 @@
+from typing import Any, Dict, List, Optional
+
+from utils.pagination import resolve_sort
+from utils.validation import coerce_value
+
+# Operators accepted in the `query` JSON, e.g. {"anno": {"$gte": 2018, "$lte": 2025}}
+FILTER_OPERATORS = {
+    "$eq": lambda column, value: column == value,
+    "$ne": lambda column, value: column != value,
+    "$gt": lambda column, value: column > value,
+    "$gte": lambda column, value: column >= value,
+    "$lt": lambda column, value: column < value,
+    "$lte": lambda column, value: column <= value,
+    "$in": lambda column, value: column.in_(value),
+    "$nin": lambda column, value: column.not_in(value),
+    "$like": lambda column, value: column.like(value),
+    "$isnull": lambda column, value: column.is_(None) if value else column.is_not(None),
+}
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split the comma-separated `fields` query parameter"""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    return names or None
+
+
+def project_columns(model, fields: List[str], sort: Optional[str] = None) -> list:
+    """Map requested field names to columns, always keeping id and the sort field for cursors"""
+    table_columns = model.__table__.columns
+    unknown = [name for name in fields if name not in table_columns]
+    if unknown:
+        raise ValueError(f"Unknown field(s) for {model.__name__}: {', '.join(unknown)}")
+
+    sort_field, _ = resolve_sort(model, sort)
+    names = ["id"] + [name for name in fields if name != "id"]
+    if sort_field not in names:
+        names.append(sort_field)
+    return [getattr(model, name) for name in names]
+
+
+def build_filters(model, query_dict: Dict[str, Any]) -> list:
+    """Compile the `query` JSON into SQL conditions with bound parameters
+
+    A plain value means equality; a dict maps operators from FILTER_OPERATORS to operands.
+    Operands (each element for $in/$nin) are converted to the column type with coerce_value.
+    Unknown fields, unknown operators and mistyped operands raise ValueError.
+    """
+    if not isinstance(query_dict, dict):
+        raise ValueError("Query must be a JSON object")
+
+    table_columns = model.__table__.columns
+    unknown = [name for name in query_dict if name not in table_columns]
+    if unknown:
+        raise ValueError(f"Unknown field(s) for {model.__name__}: {', '.join(unknown)}")
+
+    conditions = []
+    for field, condition in query_dict.items():
+        column = getattr(model, field)
+        table_column = table_columns[field]
+        if not isinstance(condition, dict):
+            conditions.append(column == coerce_value(table_column, condition))
+            continue
+        for operator, value in condition.items():
+            if operator not in FILTER_OPERATORS:
+                raise ValueError(f"Unknown operator '{operator}' on field '{field}'")
+            if operator in ("$in", "$nin") and not isinstance(value, list):
+                raise ValueError(f"Operator '{operator}' on field '{field}' expects a list")
+            if operator == "$like" and not isinstance(value, str):
+                raise ValueError(f"Operator '$like' on field '{field}' expects a string")
+            if operator == "$isnull" and not isinstance(value, bool):
+                raise ValueError(f"Operator '$isnull' on field '{field}' expects true or false")
+            if isinstance(value, (dict, list)) and operator not in ("$in", "$nin"):
+                raise ValueError(f"Operator '{operator}' on field '{field}' expects a scalar")
+            if operator in ("$in", "$nin"):
+                value = [coerce_value(table_column, v) for v in value]
+            elif operator not in ("$like", "$isnull"):
+                value = coerce_value(table_column, value)
+            conditions.append(FILTER_OPERATORS[operator](column, value))
+    return conditions
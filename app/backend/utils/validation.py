@@ -0,0 +1,73 @@
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import Date, DateTime, Float, Integer, Numeric, String
+
+
+def coerce_value(column, value: Any) -> Any:
+    """Convert `value` (JSON value or CSV text) to the Python type of `column`
+
+    Raises ValueError when it does not fit. Empty strings count as NULL for
+    non-string columns.
+    """
+    column_type = column.type
+    if value is None or (value == "" and not isinstance(column_type, String)):
+        return None
+    try:
+        if isinstance(column_type, Integer):
+            if isinstance(value, bool):
+                raise ValueError
+            if isinstance(value, float):
+                if not value.is_integer():
+                    raise ValueError
+                return int(value)
+            return int(value.strip()) if isinstance(value, str) else int(value)
+        if isinstance(column_type, (Float, Numeric)):
+            if isinstance(value, bool):
+                raise ValueError
+            return float(value)
+        if isinstance(column_type, DateTime):
+            if isinstance(value, datetime):
+                return value
+            return datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        if isinstance(column_type, Date):
+            if isinstance(value, date):
+                return value
+            return date.fromisoformat(str(value).strip())
+        if isinstance(column_type, String):
+            if isinstance(value, (dict, list)):
+                raise ValueError
+            return value if isinstance(value, str) else str(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid value {value!r} for '{column.name}' ({column_type})")
+    return value
+
+
+def coerce_row(
+    model, row: Dict[str, Any], overrides: Optional[Dict[str, Any]] = None, ignore: Iterable[str] = ("id",)
+) -> Dict[str, Any]:
+    """Validate a raw row against the model's columns and return it with typed values
+
+    `overrides` (e.g. user_id) replace whatever the row holds; `ignore`d keys are dropped.
+    Unknown fields, values of the wrong type and missing NOT NULL values raise ValueError.
+    """
+    columns = model.__table__.columns
+    if None in row:
+        # csv.DictReader files the surplus fields of a ragged line under None
+        raise ValueError(f"Too many fields: {len(row[None])} more than the header")
+    ignore = set(ignore)
+    unknown = [k for k in row if k not in columns and k not in ignore]
+    if unknown:
+        raise ValueError(f"Unknown field(s) for {model.__name__}: {', '.join(unknown)}")
+
+    values = {**{k: v for k, v in row.items() if k not in ignore}, **(overrides or {})}
+    typed = {}
+    for column in columns:
+        if column.name in ignore:
+            continue
+        value = coerce_value(column, values.get(column.name))
+        if value is None and not column.nullable:
+            raise ValueError(f"'{column.name}' is required")
+        if column.name in values:
+            typed[column.name] = value
+    return typed
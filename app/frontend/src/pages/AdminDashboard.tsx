@@ -218,15 +218,11 @@ export default function AdminDashboard() {
         return;
       }
 
-      const existingRecords = await client.entities.cave_details.query({
-        query: { anno: parseInt(excelAnno) },
-        limit: 1000
+      await client.apiCall.invoke({
+        url: `/api/v1/entities/cave_details?anno=${parseInt(excelAnno)}`,
+        method: 'DELETE'
       });
 
-      for (const record of existingRecords.data.items) {
-        await client.entities.cave_details.delete({ id: record.id });
-      }
-
       let insertedCount = 0;
       for (const detail of caveDetails) {
         try {
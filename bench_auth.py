@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'backend'))
+os.environ.setdefault("JWT_SECRET_KEY", "bench-auth-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_EXPIRE_MINUTES", "60")
+
+from core.auth import create_access_token
+from dependencies.auth import clear_token_cache, get_current_user
+
+
+async def _per_call(token: str, calls: int, cached: bool) -> float:
+    """Average seconds per get_current_user call."""
+    await get_current_user(token)
+    started = time.perf_counter()
+    for _ in range(calls):
+        if not cached:
+            clear_token_cache()
+        await get_current_user(token)
+    return (time.perf_counter() - started) / calls
+
+
+async def bench(calls: int):
+    token = create_access_token(
+        {
+            "sub": "bench-auth-user",
+            "email": "bench@example.com",
+            "name": "Bench",
+            "role": "user",
+            "last_login": "2024-01-01T12:00:00+00:00",
+        }
+    )
+    print(f"get_current_user, {calls} calls with the same bearer token")
+    uncached = await _per_call(token, calls, cached=False)
+    print(f"  verify every call : {uncached * 1e6:8.1f} µs/request")
+    cached = await _per_call(token, calls, cached=True)
+    print(f"  token cache hit   : {cached * 1e6:8.1f} µs/request  ({uncached / cached:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure per-request auth overhead with and without the token cache")
+    parser.add_argument("--calls", type=int, default=20000, help="Number of authenticated requests to simulate")
+    args = parser.parse_args()
+    asyncio.run(bench(args.calls))
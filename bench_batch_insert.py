@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'backend'))
+
+from core.database import db_manager
+from models.extraction_data import Extraction_data
+from services.extraction_data import Extraction_dataService
+from services.rollups import refresh_rollup_scope
+from sqlalchemy import delete
+
+PROVINCES = ["BA", "BT", "BR", "FG", "LE", "TA"]
+MATERIALS = ["Calcare", "Calcarenite", "Argilla", "Sabbia", "Ghiaia", "Pietra"]
+USER_ID = "bench-batch-insert"
+
+
+def _payload(rows: int):
+    """Synthetic extraction_data batch as sent to POST /batch."""
+    return [
+        {
+            "anno": random.randint(2000, 2024),
+            "provincia": random.choice(PROVINCES),
+            "materiale": random.choice(MATERIALS),
+            "volume_m3": round(random.uniform(100, 100000), 2),
+        }
+        for _ in range(rows)
+    ]
+
+
+async def _cleanup():
+    async with db_manager.async_session_maker() as db:
+        await db.execute(delete(Extraction_data).where(Extraction_data.user_id == USER_ID))
+        await refresh_rollup_scope(db, Extraction_data, user_id=USER_ID)
+        await db.commit()
+
+
+async def bench(rows: int):
+    await db_manager.init_db()
+    await db_manager.create_tables()
+    await _cleanup()
+    payload = _payload(rows)
+    print(f"{db_manager.engine.dialect.name}: inserting {rows} extraction_data rows")
+
+    async with db_manager.async_session_maker() as db:
+        service = Extraction_dataService(db)
+        started = time.perf_counter()
+        for item in payload:
+            await service.create(dict(item), user_id=USER_ID)
+        per_row = time.perf_counter() - started
+    print(f"  per-row create : {per_row:8.3f}s  {rows / per_row:10.0f} rows/s")
+    await _cleanup()
+
+    async with db_manager.async_session_maker() as db:
+        service = Extraction_dataService(db)
+        started = time.perf_counter()
+        await service.create_many(payload, user_id=USER_ID)
+        bulk = time.perf_counter() - started
+    print(f"  create_many    : {bulk:8.3f}s  {rows / bulk:10.0f} rows/s  ({per_row / bulk:.1f}x)")
+
+    await _cleanup()
+    await db_manager.close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-row and bulk inserts for POST /batch")
+    parser.add_argument("--rows", type=int, default=1000, help="Batch size")
+    args = parser.parse_args()
+    asyncio.run(bench(args.rows))
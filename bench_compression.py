@@ -0,0 +1,85 @@
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'backend'))
+
+from core.compression import brotli, compress_body
+
+PROVINCES = ["BA", "BT", "BR", "FG", "LE", "TA"]
+MATERIALS = ["Calcare", "Calcarenite", "Argilla", "Sabbia", "Ghiaia", "Pietra"]
+STATES = ["AUTORIZZATA", "ATTIVA", "SOSPESA", "CESSATA"]
+LAMBDA_RESPONSE_LIMIT = 6 * 1024 * 1024
+
+
+def _word(low: int, high: int) -> str:
+    return "".join(random.choices(string.ascii_lowercase, k=random.randint(low, high))).capitalize()
+
+
+def _cave_details_page(rows: int) -> bytes:
+    """JSON body of GET /api/v1/entities/cave_details?limit=<rows>, with realistic values."""
+    created_at = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    items = []
+    for i in range(rows):
+        decreed = date(2005, 1, 1) + timedelta(days=random.randint(0, 6000))
+        items.append(
+            {
+                "id": 100000 - i,
+                "user_id": "0f6c1e7a-5b1d-4c1e-9a2b-3d4e5f6a7b8c",
+                "anno": 2024,
+                "numero_fascicolo": f"{random.randint(1, 999)}/{random.randint(1990, 2024)}",
+                "azienda": f"{_word(5, 12)} {_word(4, 10)} S.r.l.",
+                "localita": f"Contrada {_word(5, 12)}",
+                "comune": _word(4, 14),
+                "provincia": random.choice(PROVINCES),
+                "dati_catastali": f"Fg. {random.randint(1, 150)} p.lle {random.randint(1, 900)}",
+                "stato_cava": random.choice(STATES),
+                "aperta_fino_al": None,
+                "materiale": random.choice(MATERIALS),
+                "numero_decreto": str(random.randint(1, 500)),
+                "data_decreto": decreed.isoformat(),
+                "scadenza_autorizzazione": (decreed + timedelta(days=3650)).isoformat(),
+                "created_at": created_at.isoformat(),
+            }
+        )
+    page = {"items": items, "total": 4800, "skip": 0, "limit": rows, "next_cursor": None}
+    return json.dumps(page, ensure_ascii=False).encode("utf-8")
+
+
+def _encode(body: bytes, encoding: str, repeat: int):
+    """(compressed size, average encode time in ms)."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        compressed = compress_body(body, encoding)
+    return len(compressed), (time.perf_counter() - started) / repeat * 1000
+
+
+def bench(pages, repeat: int):
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    print("cave_details list pages: bytes on the wire and encode cost")
+    columns = " ".join(f"{e + ' bytes':>11} {e + ' ms':>8} {'ratio':>6}" for e in encodings)
+    print(f"  {'rows':>5} {'identity':>10} {columns}")
+    for rows in pages:
+        body = _cave_details_page(rows)
+        line = f"  {rows:>5} {len(body):>10} "
+        for encoding in encodings:
+            size, ms = _encode(body, encoding, repeat)
+            line += f"{size:>11} {ms:>8.2f} {len(body) / size:>5.1f}x "
+        print(line)
+        if len(body) * 4 / 3 > LAMBDA_RESPONSE_LIMIT:
+            print("        identity body exceeds the 6 MB Lambda response limit once base64 encoded")
+    if brotli is None:
+        print("  (brotli not installed: gzip only)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure response compression on cave_details list pages")
+    parser.add_argument("--pages", type=int, nargs="+", default=[20, 100, 500, 2000], help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=20, help="Encodes per measurement")
+    args = parser.parse_args()
+    random.seed(42)
+    bench(args.pages, args.repeat)
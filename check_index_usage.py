@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import importlib
+import os
+import random
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'backend'))
+
+from core.database import Base, db_manager
+from sqlalchemy import Float, Integer, delete, func, insert, select, text
+
+PROVINCES = ["BA", "BT", "BR", "FG", "LE", "TA"]
+MATERIALS = ["Calcare", "Calcarenite", "Argilla", "Sabbia", "Ghiaia", "Pietra"]
+USERS = [f"user-{i:03d}" for i in range(20)]
+YEARS = list(range(2000, 2025))
+CHUNK_SIZE = 10000
+
+
+def _fake_value(column):
+    """Generate a plausible value for a chapter table column."""
+    if column.name == "user_id":
+        return random.choice(USERS)
+    if column.name == "anno":
+        return random.choice(YEARS)
+    if column.name == "provincia":
+        return random.choice(PROVINCES)
+    if column.name in ("materiale", "classe_materiale"):
+        return random.choice(MATERIALS)
+    if isinstance(column.type, Integer):
+        return random.randint(1, 500)
+    if isinstance(column.type, Float):
+        return round(random.uniform(100, 100000), 2)
+    if column.nullable:
+        return None
+    return f"{column.name}-{random.randint(1, 9999)}"
+
+
+async def seed_table(conn, table, rows: int):
+    """Fill the table with synthetic rows until it holds at least `rows` records."""
+    existing = await conn.scalar(select(func.count()).select_from(table))
+    missing = rows - existing
+    if missing <= 0:
+        print(f"{table.name} already holds {existing} rows")
+        return
+    print(f"Seeding {missing} rows into {table.name}...")
+    columns = [c for c in table.columns if c.name not in ("id", "created_at", "updated_at")]
+    while missing > 0:
+        size = min(CHUNK_SIZE, missing)
+        await conn.execute(insert(table), [{c.name: _fake_value(c) for c in columns} for _ in range(size)])
+        missing -= size
+
+
+async def explain(conn, statement) -> str:
+    """Return the query plan for a statement as plain text."""
+    compiled = statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    if conn.dialect.name == "postgresql":
+        result = await conn.execute(text(f"EXPLAIN {compiled}"))
+        return "\n".join(row[0] for row in result.fetchall())
+    result = await conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+    return "\n".join(row[-1] for row in result.fetchall())
+
+
+def uses_index(plan: str, table_name: str) -> bool:
+    """True when the plan reaches the table through an index instead of a full scan."""
+    if f"Seq Scan on {table_name}" in plan:
+        return False
+    if f"SCAN {table_name}" in plan and "USING" not in plan:
+        return False
+    return "Index" in plan or "USING INDEX" in plan or "USING COVERING INDEX" in plan
+
+
+async def check(table_name: str, rows: int, seed: bool) -> bool:
+    # Chapter models live in a module named after their table
+    importlib.import_module(f"models.{table_name}")
+    await db_manager.init_db()
+    await db_manager.create_tables()
+    table = Base.metadata.tables[table_name]
+
+    async with db_manager.engine.begin() as conn:
+        if seed:
+            await seed_table(conn, table, rows)
+        await conn.execute(text(f"ANALYZE {table_name}"))
+
+    user_id, anno = USERS[0], YEARS[-1]
+    filters = [table.c.user_id == user_id, table.c.anno == anno]
+    queries = {
+        "list": select(table).where(*filters).order_by(table.c.id.desc()).offset(0).limit(20),
+        "count": select(func.count(table.c.id)).where(*filters),
+        "reset": delete(table).where(*filters),
+    }
+
+    ok = True
+    async with db_manager.engine.connect() as conn:
+        for name, statement in queries.items():
+            plan = await explain(conn, statement)
+            passed = uses_index(plan, table_name)
+            ok = ok and passed
+            print(f"[{'PASS' if passed else 'FAIL'}] {name} query on {table_name}")
+            print("    " + plan.replace("\n", "\n    "))
+
+    await db_manager.close_db()
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify that list, count and reset queries use index scans")
+    parser.add_argument("--table", default="extraction_data", help="Chapter table to check")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Minimum number of rows in the table")
+    parser.add_argument("--no-seed", action="store_true", help="Do not insert synthetic rows")
+    args = parser.parse_args()
+
+    success = asyncio.run(check(args.table, args.rows, not args.no_seed))
+    sys.exit(0 if success else 1)
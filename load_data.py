@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'backend'))
+
+from core.database import db_manager
+from services.loader import LoaderService, detect_format
+
+
+async def load(entity: str, path: str, user_id: str, fmt: str):
+    """Stream a CSV/NDJSON file into an entity table."""
+    await db_manager.init_db()
+    await db_manager.create_tables()
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as stream:
+            async with db_manager.async_session_maker() as db:
+                result = await LoaderService(db).load(entity, stream, fmt, user_id)
+    finally:
+        await db_manager.close_db()
+
+    print(f"✓ Loaded {result['loaded']} rows into {entity} "
+          f"in {result['elapsed_seconds']}s ({result['rows_per_second']} rows/s)")
+    if result["error_count"]:
+        print(f"✗ Skipped {result['error_count']} invalid records:")
+        for error in result["errors"]:
+            print(f"    line {error['line']}: {error['error']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk load CSV or NDJSON into an entity table")
+    parser.add_argument("entity", help="Target table, e.g. extraction_data")
+    parser.add_argument("path", help="CSV (with header row) or NDJSON file")
+    parser.add_argument("--user-id", required=True, help="Owner of the loaded rows")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Default: from the file extension")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(load(args.entity, args.path, args.user_id, detect_format(args.path, args.format)))
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
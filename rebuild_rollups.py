@@ -0,0 +1,33 @@
+import argparse
+import asyncio
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'backend'))
+
+from core.database import db_manager
+from models.registry import get_entity_model
+from services.rollups import rebuild_rollups
+
+
+async def rebuild(tables):
+    """Recompute the rollup tables from the chapter tables in a single transaction."""
+    models = [get_entity_model(t) for t in tables] if tables else None
+    await db_manager.init_db()
+    await db_manager.create_tables()
+    async with db_manager.engine.begin() as conn:
+        counts = await rebuild_rollups(conn, models)
+    for table, groups in counts.items():
+        print(f"✓ {table}: {groups} groups")
+    await db_manager.close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the per-(user, anno, provincia, materiale) rollup tables")
+    parser.add_argument("tables", nargs="*", help="Chapter tables to rebuild (default: all with a rollup)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(rebuild(args.tables))
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)